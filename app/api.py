@@ -65,6 +65,7 @@ from app.clients.serpapi import (
 from app.config import settings, validate_config
 from app.models import BriefOutput
 from app.store.database import BriefLog, EntityRecord, get_session, init_db
+from app.utils import jsonio
 from app.clients.apollo import ApolloClient, normalize_candidate, normalize_enrichment
 from app.sync.auto_sync import (
     _extract_next_steps,
@@ -3324,7 +3325,7 @@ def list_recent_briefs(limit: int = Query(20, ge=1, le=100)):
                 "company": row.company,
                 "topic": row.topic,
                 "confidence_score": row.confidence_score,
-                "brief_json": json.loads(row.brief_json) if row.brief_json else None,
+                "brief_json": jsonio.loads(row.brief_json) if row.brief_json else None,
                 "brief_markdown": row.brief_markdown,
                 "created_at": row.created_at.isoformat() if row.created_at else None,
             }
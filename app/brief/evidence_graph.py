@@ -163,6 +163,17 @@ class EvidenceGraph:
         self.ledger.append(row)
         return row
 
+    def log_retrieval_batch(
+        self,
+        entries: list[dict[str, Any]],
+    ) -> list[RetrievalLedgerRow]:
+        """Log several retrieval queries at once, preserving their order.
+
+        Each entry takes the same keys as ``log_retrieval`` (query, intent,
+        results, selected_evidence_ids).
+        """
+        return [self.log_retrieval(**entry) for entry in entries]
+
     # --- Queries ---
 
     def get_visibility_ledger_rows(self) -> list[RetrievalLedgerRow]:
@@ -1175,27 +1186,29 @@ def run_fail_closed_gates(
 # Visibility Sweep Query Battery
 # ---------------------------------------------------------------------------
 
-# Full 16-query visibility sweep per the spec
-VISIBILITY_QUERY_TEMPLATES: list[tuple[str, str]] = [
+# Full 16-query visibility sweep per the spec.
+# Each template carries the serpapi VISIBILITY_CATEGORIES bucket its hits land in
+# (None = logged to the ledger only, not bucketed).
+VISIBILITY_QUERY_TEMPLATES: list[tuple[str, str, str | None]] = [
     # A) TED/TEDx (explicit, 4 queries)
-    ('"{name}" TED', "visibility"),
-    ('"{name}" TEDx', "visibility"),
-    ('site:ted.com "{name}"', "visibility"),
-    ('site:youtube.com "{name}" TEDx', "visibility"),
+    ('"{name}" TED', "visibility", "ted"),
+    ('"{name}" TEDx', "visibility", "tedx"),
+    ('site:ted.com "{name}"', "visibility", "ted"),
+    ('site:youtube.com "{name}" TEDx', "visibility", "tedx"),
     # B) Keynotes / Conferences (4 queries)
-    ('"{name}" keynote', "visibility"),
-    ('"{name}" conference talk', "visibility"),
-    ('"{name}" summit speaker', "visibility"),
-    ('"{name}" panel discussion', "visibility"),
+    ('"{name}" keynote', "visibility", "keynote"),
+    ('"{name}" conference talk', "visibility", "conference"),
+    ('"{name}" summit speaker', "visibility", "summit"),
+    ('"{name}" panel discussion', "visibility", "panel"),
     # C) Podcasts / Webinars / Interviews (4 queries)
-    ('"{name}" podcast', "visibility"),
-    ('"{name}" webinar', "visibility"),
-    ('"{name}" interview video', "visibility"),
-    ('"{name}" fireside chat', "visibility"),
+    ('"{name}" podcast', "visibility", "podcast"),
+    ('"{name}" webinar', "visibility", "webinar"),
+    ('"{name}" interview video', "visibility", "interview_video"),
+    ('"{name}" fireside chat', "visibility", "interview_video"),
     # D) YouTube / Vimeo / Slide decks (3 queries)
-    ('"{name}" YouTube talk', "visibility"),
-    ('"{name}" Vimeo talk', "visibility"),
-    ('"{name}" SlideShare', "visibility"),
+    ('"{name}" YouTube talk', "visibility", "youtube_talk"),
+    ('"{name}" Vimeo talk', "visibility", None),
+    ('"{name}" SlideShare', "visibility", None),
 ]
 
 # Category groupings for audit
@@ -1212,19 +1225,24 @@ def _get_required_visibility_queries(name: str) -> list[str]:
     return [tpl[0].replace("{name}", name) for tpl in VISIBILITY_QUERY_TEMPLATES]
 
 
-def build_visibility_queries(name: str, company: str = "") -> list[tuple[str, str]]:
+def build_visibility_queries(
+    name: str, company: str = "",
+) -> list[tuple[str, str, str | None]]:
     """Build the full visibility sweep query battery.
 
-    Returns list of (query_string, intent) tuples.
+    Returns list of (query_string, intent, category) tuples, where category is
+    the VISIBILITY_CATEGORIES bucket for the query's hits (or None).
     """
     queries = []
-    for template, intent in VISIBILITY_QUERY_TEMPLATES:
+    for template, intent, category in VISIBILITY_QUERY_TEMPLATES:
         query = template.replace("{name}", name)
-        queries.append((query, intent))
+        queries.append((query, intent, category))
 
     # Add company-qualified variant for top queries if company is provided
     if company:
-        queries.append((f'"{name}" "{company}" keynote OR conference OR podcast', "visibility"))
+        queries.append((
+            f'"{name}" "{company}" keynote OR conference OR podcast', "visibility", "keynote",
+        ))
 
     return queries
 
@@ -20,6 +20,7 @@ import hashlib
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 from app.clients.openai_client import LLMClient
 from app.models import (
@@ -307,17 +308,23 @@ def _format_concerns(evidence: RetrievedEvidence) -> str:
     return "\n".join(parts)
 
 
+@lru_cache(maxsize=4096)
 def _compute_snippet_hash(text: str) -> str:
+    # Memoized: the same excerpt is hashed once per section that cites it
     return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
 
 
-def _parse_citation(raw: dict) -> Citation:
-    """Parse a citation dict from the LLM response, filling in snippet_hash."""
+def _parse_citation(raw: dict, default_timestamp: str | None = None) -> Citation:
+    """Parse a citation dict from the LLM response, filling in snippet_hash.
+
+    Citations without a timestamp get *default_timestamp*, or the current
+    UTC time when none is given.
+    """
     excerpt = raw.get("excerpt", "")
-    return Citation(
+    return Citation.intern(
         source_type=SourceType(raw.get("source_type", "fireflies")),
         source_id=raw.get("source_id", "unknown"),
-        timestamp=raw.get("timestamp") or datetime.utcnow().isoformat(),
+        timestamp=raw.get("timestamp") or default_timestamp or datetime.utcnow().isoformat(),
         excerpt=excerpt,
         snippet_hash=raw.get("snippet_hash") or _compute_snippet_hash(excerpt),
         link=raw.get("link"),
@@ -327,7 +334,9 @@ def _parse_citation(raw: dict) -> Citation:
 def _parse_citations(raw_list: list[dict] | None) -> list[Citation]:
     if not raw_list:
         return []
-    return [_parse_citation(c) for c in raw_list]
+    # One fallback timestamp for the whole list rather than a clock read per citation
+    now = datetime.utcnow().isoformat()
+    return [_parse_citation(c, now) for c in raw_list]
 
 
 def _parse_evidence_tag(raw: str | None) -> EvidenceTag:
@@ -345,6 +354,12 @@ def _parse_evidence_tag(raw: str | None) -> EvidenceTag:
                        EvidenceTag.unknown)
 
 
+def _parse_severity(raw: str | None) -> str:
+    """Parse a watchout severity from LLM output, defaulting to medium."""
+    severity = (raw or "").strip().lower()
+    return severity if severity in ("low", "medium", "high") else "medium"
+
+
 def _parse_tagged_claim(raw: dict | None) -> TaggedClaim | None:
     """Parse a tagged claim from LLM output."""
     if not raw:
@@ -564,7 +579,7 @@ def _parse_llm_response(
         watchouts.append(
             Watchout(
                 description=w_raw.get("description", ""),
-                severity=w_raw.get("severity", "medium"),
+                severity=_parse_severity(w_raw.get("severity")),
                 citations=_parse_citations(w_raw.get("citations")),
             )
         )
@@ -789,6 +804,8 @@ def _build_fallback_brief(
 ) -> BriefOutput:
     """Build a minimal brief from raw evidence when LLM is unavailable."""
     header.confidence_score = 0.1
+    # Undated evidence is stamped with the brief's own generation time
+    generated_at = header.brief_generated_at.isoformat()
 
     last = None
     if evidence.last_interaction:
@@ -798,10 +815,10 @@ def _build_fallback_brief(
             summary=li.get("summary") or "See raw evidence",
             commitments=[],
             citations=[
-                Citation(
+                Citation.intern(
                     source_type=SourceType(li["source_type"]),
                     source_id=li["source_id"],
-                    timestamp=li.get("date") or datetime.utcnow().isoformat(),
+                    timestamp=li.get("date") or generated_at,
                     excerpt=(li.get("summary") or "")[:200],
                     snippet_hash=_compute_snippet_hash(li.get("summary") or ""),
                 )
@@ -814,10 +831,10 @@ def _build_fallback_brief(
             OpenLoop(
                 description=ai["description"],
                 citations=[
-                    Citation(
+                    Citation.intern(
                         source_type=SourceType(ai["source_type"]),
                         source_id=ai["source_id"],
-                        timestamp=ai.get("date") or datetime.utcnow().isoformat(),
+                        timestamp=ai.get("date") or generated_at,
                         excerpt=ai["description"][:200],
                         snippet_hash=_compute_snippet_hash(ai["description"]),
                     )
@@ -256,8 +256,7 @@ def run_pipeline(
     json_path = output_dir / f"{base_name}.json"
     md_path = output_dir / f"{base_name}.md"
 
-    brief_json = brief.model_dump_json(indent=2)
-    json_path.write_text(brief_json, encoding="utf-8")
+    json_path.write_text(brief.model_dump_json(indent=2), encoding="utf-8")
     md_path.write_text(markdown, encoding="utf-8")
 
     logger.info("Wrote %s and %s", json_path, md_path)
@@ -270,7 +269,8 @@ def run_pipeline(
             company=company,
             topic=topic,
             meeting_datetime=meeting_dt,
-            brief_json=brief_json,
+            # Compact for storage: the pretty-printed copy is the file above
+            brief_json=brief.model_dump_json(),
             brief_markdown=markdown,
             confidence_score=brief.header.confidence_score,
             source_record_ids=json.dumps([r.id for r in evidence.all_source_records]),
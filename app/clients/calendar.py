@@ -123,6 +123,7 @@ class CalendarClient:
                 "response_status": att.get("responseStatus", "needsAction"),
                 "organizer": att.get("organizer", False),
                 "self": att.get("self", False),
+                "resource": att.get("resource", False),
             })
 
         organizer = event.get("organizer", {})
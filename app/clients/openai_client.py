@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from typing import Any
 
 from app.config import settings
@@ -12,12 +13,22 @@ logger = logging.getLogger(__name__)
 
 
 def _get_openai_client():
+    return _openai_client_for(settings.openai_api_key)
+
+
+@lru_cache(maxsize=4)
+def _openai_client_for(api_key: str):
+    """Build the SDK client once per API key.
+
+    Every LLMClient/EmbeddingClient shares it, and with it the SDK's pooled
+    HTTP connections, instead of opening fresh TLS connections per instance.
+    """
     try:
         from openai import OpenAI
-        if not settings.openai_api_key:
+        if not api_key:
             logger.warning("OpenAI API key not configured – LLM calls will fail")
             return None
-        return OpenAI(api_key=settings.openai_api_key)
+        return OpenAI(api_key=api_key)
     except ImportError:
         logger.error("openai package not installed. Run: pip install openai")
         return None
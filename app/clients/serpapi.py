@@ -13,8 +13,12 @@ API docs: https://serpapi.com/search-api
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
 import re
+import time
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
 from typing import Any
 
 import httpx
@@ -25,11 +29,26 @@ logger = logging.getLogger(__name__)
 
 SERPAPI_URL = "https://serpapi.com/search"
 
+# --- regex constants ---
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]")
+_HOST_RE = re.compile(r"^https?://([^/?#:]+)")
+
+# Adaptive rate limiting: once the quota reported in the response headers
+# drops below the watermark, remaining calls are spread across the reset window.
+_RATE_LIMIT_LOW_WATERMARK = 5
+_RATE_LIMIT_MAX_DELAY_S = 30.0
+_RETRY_AFTER_DEFAULT_S = 2.0
+
 # The 10 mandatory public visibility categories for the sweep
-VISIBILITY_CATEGORIES: list[str] = [
+VISIBILITY_CATEGORIES: tuple[str, ...] = (
     "ted", "tedx", "keynote", "conference", "summit",
     "podcast", "webinar", "youtube_talk", "panel", "interview_video",
-]
+)
+
+
+def _empty_visibility_results() -> dict[str, list[dict[str, Any]]]:
+    """Return a fresh ``{category: []}`` dict covering every visibility category."""
+    return {cat: [] for cat in VISIBILITY_CATEGORIES}
 
 
 # ---------------------------------------------------------------------------
@@ -71,19 +90,46 @@ _TIER_MAP: dict[str, int] = {
 }
 
 
+def _registered_host_tier(host: str) -> int | None:
+    """Look up a host, then each parent domain, in the tier map."""
+    while True:
+        tier = _TIER_MAP.get(host)
+        if tier is not None:
+            return tier
+        dot = host.find(".")
+        if dot < 0:
+            return None
+        host = host[dot + 1:]
+
+
 def classify_source_tier(url: str) -> int:
     """Classify a URL into a source tier (1=Primary, 2=Secondary, 3=Low)."""
     if not url:
         return SourceTier.LOW
-    url_lower = url.lower()
-    for domain, tier in _TIER_MAP.items():
-        if domain in url_lower:
+    # SerpAPI links are nearly always lowercase already; skip the copy then
+    url_lower = url if url.islower() else url.lower()
+    if "://" not in url_lower:
+        # Scheme-less input: fall back to a substring scan of the known domains
+        for domain, tier in _TIER_MAP.items():
+            if domain in url_lower:
+                return tier
+        return SourceTier.SECONDARY
+    match = _HOST_RE.match(url_lower)
+    if match is not None:
+        tier = _registered_host_tier(match.group(1))
+        if tier is not None:
             return tier
     # Check if it's a company domain (not social media / generic)
     # Company domains are primary when they match the subject's company
     return SourceTier.SECONDARY  # Default to secondary for unknown domains
 
 
+@lru_cache(maxsize=1024)
+def _company_slug(company: str) -> str:
+    """Collapse a company name to the bare token used in ``site:`` operators."""
+    return _NON_ALNUM.sub("", company.lower())
+
+
 def _normalize_result(result: dict[str, Any]) -> dict[str, Any]:
     """Extract fields from a SerpAPI organic result with tier classification."""
     link = result.get("link", "")
@@ -97,13 +143,62 @@ def _normalize_result(result: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _header_float(headers: Any, name: str) -> float | None:
+    """Read a numeric response header, returning None if absent or malformed."""
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
 class SerpAPIClient:
-    """Async client for SerpAPI with targeted query generation."""
+    """Async client for SerpAPI with targeted query generation.
+
+    Queries fan out concurrently (bounded by ``max_concurrency``) and are paced
+    by the rate-limit headers SerpAPI returns, rather than a fixed delay.
+    """
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, max_concurrency: int = 4):
         self.api_key = api_key or settings.serpapi_api_key
         if not self.api_key:
             logger.warning("SerpAPI key not configured – web search disabled")
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._not_before = 0.0  # monotonic time before which no request is released
+
+    async def _wait_for_budget(self) -> None:
+        """Delay the next request if the rate limiter has pushed it back."""
+        delay = self._not_before - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(min(delay, _RATE_LIMIT_MAX_DELAY_S))
+
+    def _update_rate_limit(self, status_code: int, headers: Any) -> None:
+        """Adjust pacing from the response's rate-limit headers."""
+        now = time.monotonic()
+        if status_code == 429:
+            retry_after = _header_float(headers, "Retry-After")
+            self._not_before = max(
+                self._not_before, now + (retry_after or _RETRY_AFTER_DEFAULT_S),
+            )
+            return
+
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if remaining is None or reset is None or remaining >= _RATE_LIMIT_LOW_WATERMARK:
+            return
+        # Reset may be an epoch timestamp or a number of seconds from now
+        window = reset - time.time() if reset > 1e9 else reset
+        if window <= 0:
+            return
+        spacing = window / max(remaining, 1.0)
+        self._not_before = max(self._not_before, now + spacing)
+        logger.info(
+            "SerpAPI quota low (%d remaining, reset in %.0fs) – pacing at %.1fs",
+            remaining, window, spacing,
+        )
 
     async def search(
         self,
@@ -123,25 +218,40 @@ class SerpAPIClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                resp = await client.get(SERPAPI_URL, params=params)
-                if resp.status_code == 403:
-                    logger.warning("SerpAPI auth failed – check API key")
-                    return []
-                if resp.status_code == 429:
-                    logger.warning("SerpAPI rate limited")
-                    return []
-                if resp.status_code != 200:
-                    logger.warning(
-                        "SerpAPI error %d: %s", resp.status_code, resp.text[:200]
-                    )
-                    return []
-                data = resp.json()
-                return data.get("organic_results", [])
+            async with self._semaphore:
+                await self._wait_for_budget()
+                async with httpx.AsyncClient(timeout=20) as client:
+                    resp = await client.get(SERPAPI_URL, params=params)
+                self._update_rate_limit(resp.status_code, resp.headers)
+            if resp.status_code == 403:
+                logger.warning("SerpAPI auth failed – check API key")
+                return []
+            if resp.status_code == 429:
+                logger.warning("SerpAPI rate limited")
+                return []
+            if resp.status_code != 200:
+                logger.warning(
+                    "SerpAPI error %d: %s", resp.status_code, resp.text[:200]
+                )
+                return []
+            data = resp.json()
+            return data.get("organic_results", [])
         except Exception:
             logger.exception("SerpAPI search failed for: %s", query)
             return []
 
+    async def _run_queries(
+        self,
+        queries: list[tuple[str, str]],
+        num: int,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run (category, query) pairs concurrently and normalise the hits."""
+        hits = await asyncio.gather(*(self.search(q, num=num) for _, q in queries))
+        return {
+            category: [_normalize_result(r) for r in category_hits]
+            for (category, _), category_hits in zip(queries, hits)
+        }
+
     async def search_person(
         self,
         name: str,
@@ -178,7 +288,7 @@ class SerpAPIClient:
         # 3. Company site bio search
         if company:
             # Try to find them on their company's website
-            company_slug = re.sub(r"[^a-zA-Z0-9]", "", company.lower())
+            company_slug = _company_slug(company)
             queries.append((
                 "company_site",
                 f'"{name}" site:{company_slug}.com OR site:{company_slug}.io '
@@ -209,13 +319,7 @@ class SerpAPIClient:
             f'"{name}" site:find-and-update.company-information.service.gov.uk'
         ))
 
-        results: dict[str, list[dict[str, Any]]] = {}
-        for category, query in queries:
-            hits = await self.search(query, num=8)
-            results[category] = [_normalize_result(r) for r in hits]
-            await asyncio.sleep(0.3)
-
-        return results
+        return await self._run_queries(queries, num=8)
 
     async def search_public_visibility(
         self,
@@ -229,7 +333,7 @@ class SerpAPIClient:
         youtube_talk, panel, interview_video
         """
         if not self.api_key:
-            return {cat: [] for cat in VISIBILITY_CATEGORIES}
+            return _empty_visibility_results()
 
         base = f'"{name}"'
         if company:
@@ -248,13 +352,7 @@ class SerpAPIClient:
             ("interview_video", f'{base} "interview" "video" OR site:youtube.com "interview"'),
         ]
 
-        results: dict[str, list[dict[str, Any]]] = {}
-        for category, query in queries:
-            hits = await self.search(query, num=5)
-            results[category] = [_normalize_result(r) for r in hits]
-            await asyncio.sleep(0.3)
-
-        return results
+        return await self._run_queries(queries, num=5)
 
     async def search_visibility_sweep_with_ledger(
         self,
@@ -271,54 +369,28 @@ class SerpAPIClient:
         from app.brief.evidence_graph import build_visibility_queries
 
         queries = build_visibility_queries(name, company)
-        results: dict[str, list[dict[str, Any]]] = {}
+        category_results = _empty_visibility_results()
+        ledger_entries: list[dict[str, Any]] = []
 
-        for i, (query, intent) in enumerate(queries):
-            category = f"visibility_{i}"
-            if self.api_key:
-                hits = await self.search(query, num=5)
-                normalized = [_normalize_result(r) for r in hits]
-            else:
-                hits = []
-                normalized = []
+        if self.api_key:
+            all_hits = await asyncio.gather(
+                *(self.search(query, num=5) for query, _, _ in queries)
+            )
+        else:
+            all_hits = [[] for _ in queries]
 
-            results[category] = normalized
+        for (query, intent, category), hits in zip(queries, all_hits):
+            # Realised once: the same list feeds both the bucket and the ledger
+            normalized = list(map(_normalize_result, hits))
+
+            if category is not None:
+                category_results[category].extend(normalized)
 
             # Log to retrieval ledger (always, even with 0 results)
-            if graph is not None:
-                graph.log_retrieval(
-                    query=query,
-                    intent=intent,
-                    results=normalized,
-                )
+            ledger_entries.append({"query": query, "intent": intent, "results": normalized})
 
-            if self.api_key:
-                await asyncio.sleep(0.3)
-
-        # Also populate the standard VISIBILITY_CATEGORIES dict
-        category_results: dict[str, list[dict[str, Any]]] = {}
-        for cat in VISIBILITY_CATEGORIES:
-            category_results[cat] = []
-
-        # Map queries back to categories based on keywords
-        category_keywords = {
-            "ted": ["ted.com", '"TED"', "TED talk"],
-            "tedx": ["TEDx", "tedx.com"],
-            "keynote": ["keynote"],
-            "conference": ["conference"],
-            "summit": ["summit"],
-            "podcast": ["podcast"],
-            "webinar": ["webinar"],
-            "youtube_talk": ["YouTube talk", "youtube.com"],
-            "panel": ["panel"],
-            "interview_video": ["interview video", "fireside"],
-        }
-        for key, items in results.items():
-            query_text = queries[int(key.split("_")[1])][0] if key.startswith("visibility_") else ""
-            for cat, keywords in category_keywords.items():
-                if any(kw.lower() in query_text.lower() for kw in keywords):
-                    category_results[cat].extend(items)
-                    break
+        if graph is not None:
+            graph.log_retrieval_batch(ledger_entries)
 
         return category_results
 
@@ -344,16 +416,18 @@ class SerpAPIClient:
                 "company_site": "bio",
                 "registry": "registry",
             }
-            for category, items in results.items():
-                intent = intent_map.get(category, "bio")
-                q_parts = [f'"{name}"']
-                if company:
-                    q_parts.append(f'"{company}"')
-                graph.log_retrieval(
-                    query=f"{' '.join(q_parts)} [{category}]",
-                    intent=intent,
-                    results=items,
-                )
+            q_parts = [f'"{name}"']
+            if company:
+                q_parts.append(f'"{company}"')
+            base_query = " ".join(q_parts)
+            graph.log_retrieval_batch([
+                {
+                    "query": f"{base_query} [{category}]",
+                    "intent": intent_map.get(category, "bio"),
+                    "results": items,
+                }
+                for category, items in results.items()
+            ])
 
         return results
 
@@ -371,13 +445,7 @@ class SerpAPIClient:
             return {}
 
         queries = queries_override or []
-        results: dict[str, list[dict[str, Any]]] = {}
-        for category, query in queries:
-            hits = await self.search(query, num=5)
-            results[category] = [_normalize_result(r) for r in hits]
-            await asyncio.sleep(0.3)
-
-        return results
+        return await self._run_queries(queries, num=5)
 
 
 # ---------------------------------------------------------------------------
@@ -391,53 +459,106 @@ _TIER_LABELS = {
 }
 
 
-def format_web_results_for_prompt(
-    results: dict[str, list[dict[str, Any]]],
-) -> str:
-    """Format categorised search results into a text block for the LLM prompt.
+_WEB_RESULTS_PREAMBLE = (
+    "The following web search results were retrieved in real-time. "
+    "Use these as primary sources for your analysis. "
+    "Cite the source URL when referencing a specific result. "
+    "Source quality tier is indicated in brackets."
+)
 
-    Includes source tier classification. Returns an empty string if no results.
-    """
-    sections: list[str] = []
+_WEB_CATEGORY_LABELS: tuple[tuple[str, str], ...] = (
+    ("general", "General Search Results"),
+    ("linkedin", "LinkedIn Results"),
+    ("news", "News & Articles"),
+    ("talks", "Conference Talks & Podcasts"),
+    ("company_site", "Company Website Results"),
+    ("registry", "Corporate Registry Results"),
+)
 
-    total = sum(len(v) for v in results.values())
-    if total == 0:
-        return ""
 
-    sections.append(
-        "The following web search results were retrieved in real-time. "
-        "Use these as primary sources for your analysis. "
-        "Cite the source URL when referencing a specific result. "
-        "Source quality tier is indicated in brackets."
-    )
+def _item_tier(item: dict[str, Any]) -> int:
+    """Tier of a result: its stored ``tier``, else classified from its link."""
+    tier = item.get("tier")
+    return classify_source_tier(item.get("link", "")) if tier is None else tier
 
-    category_labels = {
-        "general": "General Search Results",
-        "linkedin": "LinkedIn Results",
-        "news": "News & Articles",
-        "talks": "Conference Talks & Podcasts",
-        "company_site": "Company Website Results",
-        "registry": "Corporate Registry Results",
-    }
 
-    for category, label in category_labels.items():
-        items = results.get(category, [])
-        if not items:
-            continue
-        sections.append(f"\n**{label}:**")
-        for i, item in enumerate(items, 1):
-            tier_label = _TIER_LABELS.get(item.get("tier", 3), "LOW-QUALITY")
-            line = f"{i}. [{tier_label}] **{item['title']}**"
+def _dedupe_by_link(
+    results: Mapping[str, Iterable[dict[str, Any]]],
+    categories: Iterable[str],
+) -> dict[str, list[dict[str, Any]]]:
+    """Keep one entry per link across *categories*, preferring the highest tier.
+
+    Each category is consumed once. When a link repeats, the entry with the
+    best tier (lowest number) is kept, the first one seen on a tie, and it
+    stays in its own category. Items without a link are always kept.
+    """
+    lists = {category: list(results.get(category, ())) for category in categories}
+    best: dict[str, tuple[int, dict[str, Any]]] = {}
+    for items in lists.values():
+        for item in items:
+            link = item.get("link")
+            if link:
+                tier = _item_tier(item)
+                kept = best.get(link)
+                if kept is None or tier < kept[0]:
+                    best[link] = (tier, item)
+    deduped: dict[str, list[dict[str, Any]]] = {}
+    for category, items in lists.items():
+        kept_items = deduped[category] = []
+        for item in items:
+            link = item.get("link")
+            if link:
+                # The same dict may be listed under several categories: keep one.
+                if link not in best or best[link][1] is not item:
+                    continue
+                del best[link]
+            kept_items.append(item)
+    return deduped
+
+
+def format_web_results_for_prompt(
+    results: Mapping[str, Iterable[dict[str, Any]]],
+) -> str:
+    """Format categorised search results into a text block for the LLM prompt.
+
+    Includes source tier classification. A URL returned by several queries is
+    listed once, keeping its highest-tier entry. Each category is
+    consumed once, so callers may pass generators. Returns an empty string if
+    no results.
+    """
+    buf = io.StringIO()
+    w = buf.write
+    tier_label_for = _TIER_LABELS.get
+    deduped = _dedupe_by_link(results, (category for category, _ in _WEB_CATEGORY_LABELS))
+    for category, label in _WEB_CATEGORY_LABELS:
+        for i, item in enumerate(deduped[category], 1):
+            if i == 1:
+                w("\n\n**")
+                w(label)
+                w(":**")
+            w(f"\n{i}. [")
+            w(tier_label_for(item.get("tier", 3), "LOW-QUALITY"))
+            w("] **")
+            w(item["title"])
+            w("**")
             if item.get("source"):
-                line += f" ({item['source']})"
+                w(" (")
+                w(item["source"])
+                w(")")
             if item.get("date"):
-                line += f" [{item['date']}]"
-            line += f"\n   URL: {item['link']}"
+                w(" [")
+                w(item["date"])
+                w("]")
+            w("\n   URL: ")
+            w(item["link"])
             if item.get("snippet"):
-                line += f"\n   > {item['snippet']}"
-            sections.append(line)
+                w("\n   > ")
+                w(item["snippet"])
 
-    return "\n".join(sections)
+    body = buf.getvalue()
+    if not body:
+        return ""
+    return _WEB_RESULTS_PREAMBLE + body
 
 
 # Visibility category labels for prompt formatting
@@ -454,6 +575,11 @@ _VISIBILITY_LABELS: dict[str, str] = {
     "interview_video": "Video Interviews",
 }
 
+# (category, label) pairs in sweep order, resolved once for the formatter
+_VISIBILITY_LABEL_ORDER: tuple[tuple[str, str], ...] = tuple(
+    (cat, _VISIBILITY_LABELS.get(cat, cat)) for cat in VISIBILITY_CATEGORIES
+)
+
 
 def format_visibility_results_for_prompt(
     results: dict[str, list[dict[str, Any]]],
@@ -462,35 +588,42 @@ def format_visibility_results_for_prompt(
 
     Returns an empty string if no results.
     """
-    sections: list[str] = []
     total = sum(len(v) for v in results.values())
 
-    sections.append(
+    buf = io.StringIO()
+    w = buf.write
+    w(
         "## PUBLIC VISIBILITY SWEEP RESULTS\n"
         "The following 10 targeted searches were executed. "
         "Use these to populate the Public Visibility Report section."
     )
 
-    for category in VISIBILITY_CATEGORIES:
-        label = _VISIBILITY_LABELS.get(category, category)
+    tier_label_for = _TIER_LABELS.get
+    for category, label in _VISIBILITY_LABEL_ORDER:
         items = results.get(category, [])
-        status = f"{len(items)} results" if items else "NO RESULTS"
-        sections.append(f"\n**{label}** ({status}):")
-        if items:
-            for i, item in enumerate(items, 1):
-                tier_label = _TIER_LABELS.get(item.get("tier", 3), "LOW-QUALITY")
-                line = f"  {i}. [{tier_label}] {item['title']}"
-                if item.get("date"):
-                    line += f" [{item['date']}]"
-                line += f"\n     URL: {item['link']}"
-                if item.get("snippet"):
-                    line += f"\n     > {item['snippet']}"
-                sections.append(line)
-        else:
-            sections.append("  (No results found)")
+        w("\n\n**")
+        w(label)
+        w(f"** ({len(items)} results):" if items else "** (NO RESULTS):")
+        if not items:
+            w("\n  (No results found)")
+            continue
+        for i, item in enumerate(items, 1):
+            w(f"\n  {i}. [")
+            w(tier_label_for(item.get("tier", 3), "LOW-QUALITY"))
+            w("] ")
+            w(item["title"])
+            if item.get("date"):
+                w(" [")
+                w(item["date"])
+                w("]")
+            w("\n     URL: ")
+            w(item["link"])
+            if item.get("snippet"):
+                w("\n     > ")
+                w(item["snippet"])
 
-    sections.append(f"\n**Total visibility artifacts found:** {total}")
-    return "\n".join(sections)
+    w(f"\n\n**Total visibility artifacts found:** {total}")
+    return buf.getvalue()
 
 
 def generate_search_plan(
@@ -531,7 +664,7 @@ def generate_search_plan(
 
     # Company website
     if company:
-        company_slug = re.sub(r"[^a-zA-Z0-9]", "", company.lower())
+        company_slug = _company_slug(company)
         plan.append({
             "query": (
                 f'"{name}" site:{company_slug}.com OR site:{company_slug}.io '
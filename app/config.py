@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from functools import cached_property
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -66,11 +67,14 @@ class Settings(BaseSettings):
     project_classifier_model: str = "gpt-4o-mini"
     project_classifier_enabled: bool = True
 
-    @property
+    # ``database_url`` is fixed once settings are loaded, so the derived values
+    # below are computed on first access and then reused.
+
+    @cached_property
     def is_sqlite(self) -> bool:
         return self.database_url.startswith("sqlite")
 
-    @property
+    @cached_property
     def effective_database_url(self) -> str:
         """Return a SQLAlchemy-compatible URL.
 
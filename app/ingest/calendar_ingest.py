@@ -12,15 +12,21 @@ Produces structured meeting data stored in EntityRecord.domains JSON.
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime
 
+from rapidfuzz import fuzz, process
+from sqlalchemy.orm import load_only
+
 from app.clients.calendar import CalendarClient, normalize_event_for_storage
 from app.store.database import EntityRecord, get_session
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
+# Minimum rapidfuzz token_sort_ratio for two full names to count as the same person
+_FUZZY_NAME_CUTOFF = 90
+
 
 class CalendarIngestResult:
     """Result of a calendar ingest run."""
@@ -44,30 +50,67 @@ class CalendarIngestResult:
         }
 
 
-def _build_email_index(session) -> dict[str, EntityRecord]:
-    """Build a lowercase email → EntityRecord lookup index."""
-    index: dict[str, EntityRecord] = {}
-    entities = session.query(EntityRecord).filter(
+class _AttendeeIndex:
+    """Lookup tables for matching calendar attendees to known contacts.
+
+    ``by_email`` maps lowercase emails (and email-shaped aliases) to contacts,
+    ``by_name`` maps lowercase full names, and ``by_domain`` lists the
+    ``(lowercase name, contact)`` pairs seen under each email domain so the
+    fuzzy name+domain pass only looks at same-domain candidates.
+    """
+
+    def __init__(self) -> None:
+        self.by_email: dict[str, EntityRecord] = {}
+        self.by_name: dict[str, EntityRecord] = {}
+        self.by_domain: dict[str, list[tuple[str, EntityRecord]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_email)
+
+    def add(self, entity: EntityRecord) -> None:
+        """Index a contact under its emails, email aliases, name and domains."""
+        name = (entity.name or "").lower()
+        if name:
+            self.by_name.setdefault(name, entity)
+
+        addresses = [e.lower().strip() for e in entity.get_emails()]
+        addresses += [a.lower().strip() for a in entity.get_aliases() if "@" in a]
+        for address in addresses:
+            self.by_email[address] = entity
+            if "@" in address:
+                domain = address.split("@")[1]
+                self.by_domain.setdefault(domain, []).append((name, entity))
+
+
+def _build_email_index(session) -> _AttendeeIndex:
+    """Build the email/name/domain attendee lookup index in one pass.
+
+    Emails and aliases are JSON columns on the entity row, so this is a
+    single query; only the columns matching and attachment need are loaded,
+    leaving large blobs such as ``enrichment_json`` deferred.
+    """
+    index = _AttendeeIndex()
+    entities = session.query(EntityRecord).options(
+        load_only(
+            EntityRecord.id,
+            EntityRecord.name,
+            EntityRecord.emails,
+            EntityRecord.aliases,
+            EntityRecord.domains,
+        )
+    ).filter(
         EntityRecord.entity_type == "person"
     ).all()
 
     for entity in entities:
-        emails = entity.get_emails()
-        for email in emails:
-            index[email.lower().strip()] = entity
-
-        # Also index aliases
-        aliases = entity.get_aliases()
-        for alias in aliases:
-            if "@" in alias:
-                index[alias.lower().strip()] = entity
+        index.add(entity)
 
     return index
 
 
 def _match_attendee(
     attendee: dict,
-    email_index: dict[str, EntityRecord],
+    index: _AttendeeIndex,
 ) -> tuple[EntityRecord | None, str]:
     """Try to match an attendee to an existing contact.
 
@@ -77,28 +120,44 @@ def _match_attendee(
     if not email:
         return None, "no_email"
 
-    # Primary: exact email match
-    if email in email_index:
-        return email_index[email], "email_match"
+    # Primary: exact email match (aliases are indexed alongside emails)
+    entity = index.by_email.get(email)
+    if entity is not None:
+        return entity, "email_match"
 
-    # Secondary: alias match (already in email_index via _build_email_index)
-    # Tertiary: name + domain match
+    # Secondary: exact name match
     name = attendee.get("name", "").lower()
-    if name and "@" in email:
-        domain = email.split("@")[1]
-        for entity_email, entity in email_index.items():
-            if entity.name.lower() == name:
-                return entity, "name_match"
-            # Check if same domain
-            if "@" in entity_email and entity_email.split("@")[1] == domain:
-                if _fuzzy_name_match(name, entity.name.lower()):
-                    return entity, "name_domain_match"
+    if not name:
+        return None, "no_match"
+    entity = index.by_name.get(name)
+    if entity is not None:
+        return entity, "name_match"
+
+    # Tertiary: fuzzy name match within the same email domain
+    if "@" in email:
+        bucket = index.by_domain.get(email.split("@")[1], ())
+        for candidate_name, candidate in bucket:
+            if _initial_name_match(name, candidate_name):
+                return candidate, "name_domain_match"
+        # Otherwise the closest near-identical spelling, scored in one C call
+        if len(name.split()) >= 2:
+            full_names = {
+                i: candidate_name for i, (candidate_name, _) in enumerate(bucket)
+                if len(candidate_name.split()) >= 2
+            }
+            best = process.extractOne(
+                name, full_names,
+                scorer=fuzz.token_sort_ratio,
+                score_cutoff=_FUZZY_NAME_CUTOFF,
+            )
+            if best is not None:
+                return bucket[best[2]][1], "name_domain_match"
 
     return None, "no_match"
 
 
-def _fuzzy_name_match(name_a: str, name_b: str) -> bool:
-    """Basic name matching: first+last or last name match."""
+def _initial_name_match(name_a: str, name_b: str) -> bool:
+    """Name matching: exact, or last name + first initial."""
     parts_a = name_a.strip().split()
     parts_b = name_b.strip().split()
     if not parts_a or not parts_b:
@@ -108,16 +167,27 @@ def _fuzzy_name_match(name_a: str, name_b: str) -> bool:
         return True
     # Last name match + first initial
     if len(parts_a) >= 2 and len(parts_b) >= 2:
-        if parts_a[-1] == parts_b[-1] and parts_a[0][0] == parts_b[0][0]:
-            return True
+        return parts_a[-1] == parts_b[-1] and parts_a[0][0] == parts_b[0][0]
     return False
 
 
-def _create_contact_stub(
-    attendee: dict,
-    session,
-) -> EntityRecord:
-    """Create a minimal contact stub for an unknown attendee."""
+def _fuzzy_name_match(name_a: str, name_b: str) -> bool:
+    """Name matching: exact, last name + first initial, or a near-identical spelling."""
+    if _initial_name_match(name_a, name_b):
+        return True
+    # Typos / transliterations of a full name ("john smith" vs "john smyth")
+    return (
+        len(name_a.split()) >= 2
+        and len(name_b.split()) >= 2
+        and fuzz.token_sort_ratio(name_a, name_b) >= _FUZZY_NAME_CUTOFF
+    )
+
+
+def _create_contact_stub(attendee: dict) -> EntityRecord:
+    """Build a minimal, not-yet-persisted contact stub for an unknown attendee.
+
+    The caller adds stubs to the session in one batch once the run is done.
+    """
     email = attendee.get("email", "")
     name = attendee.get("name", "") or email.split("@")[0].replace(".", " ").title()
 
@@ -130,10 +200,7 @@ def _create_contact_stub(
         "research_status": "QUEUED",
         "linkedin_status": "not_searched",
     }
-    entity.domains = json.dumps(profile_data)
-
-    session.add(entity)
-    session.flush()  # Get the ID without committing
+    entity.domains = jsonio.dumps(profile_data)
     return entity
 
 
@@ -141,9 +208,22 @@ def _attach_meeting_to_contact(
     entity: EntityRecord,
     meeting: dict,
     match_reason: str,
+    profile_cache: dict[EntityRecord, dict] | None = None,
+    attached_at: str | None = None,
 ) -> None:
-    """Attach a meeting record to a contact's profile data."""
-    profile_data = json.loads(entity.domains or "{}")
+    """Attach a meeting record to a contact's profile data.
+
+    With *profile_cache*, the parsed profile is kept in the cache and mutated
+    in place; the caller writes it back with ``_flush_profiles`` once all
+    meetings are attached. Without it, ``entity.domains`` is updated directly.
+    *attached_at* defaults to the current UTC time.
+    """
+    if profile_cache is None:
+        profile_data = jsonio.loads(entity.domains or "{}")
+    else:
+        profile_data = profile_cache.get(entity)
+        if profile_data is None:
+            profile_data = profile_cache[entity] = jsonio.loads(entity.domains or "{}")
 
     upcoming_meetings = profile_data.get("upcoming_meetings", [])
 
@@ -155,7 +235,7 @@ def _attach_meeting_to_contact(
     meeting_record = {
         **meeting,
         "match_reason": match_reason,
-        "attached_at": datetime.utcnow().isoformat(),
+        "attached_at": attached_at or datetime.utcnow().isoformat(),
     }
     upcoming_meetings.append(meeting_record)
 
@@ -164,7 +244,14 @@ def _attach_meeting_to_contact(
     profile_data["next_meeting_title"] = upcoming_meetings[0].get("title", "")
     profile_data["next_meeting_time"] = upcoming_meetings[0].get("start_time", "")
 
-    entity.domains = json.dumps(profile_data)
+    if profile_cache is None:
+        entity.domains = jsonio.dumps(profile_data)
+
+
+def _flush_profiles(profile_cache: dict[EntityRecord, dict]) -> None:
+    """Serialize each cached profile back onto its entity once."""
+    for entity, profile_data in profile_cache.items():
+        entity.domains = jsonio.dumps(profile_data)
 
 
 def run_calendar_ingest(days: int = 7) -> CalendarIngestResult:
@@ -196,10 +283,15 @@ def run_calendar_ingest(days: int = 7) -> CalendarIngestResult:
 
     session = get_session()
     try:
-        email_index = _build_email_index(session)
+        attendee_index = _build_email_index(session)
+        # Parsed entity.domains per contact, written back once before commit
+        profile_cache: dict[EntityRecord, dict] = {}
+        pending_stubs: list[EntityRecord] = []
+        # Every attachment in this run shares one timestamp
+        attached_at = datetime.utcnow().isoformat()
         logger.info(
             "Calendar ingest: %d events, %d known contacts in index",
-            len(events), len(email_index),
+            len(events), len(attendee_index),
         )
 
         for event in events:
@@ -207,26 +299,32 @@ def run_calendar_ingest(days: int = 7) -> CalendarIngestResult:
             result.meetings.append(meeting)
 
             for attendee in event.get("attendees", []):
-                # Skip self (the calendar owner)
-                if attendee.get("self"):
+                # Skip self (the calendar owner) and rooms/equipment, which
+                # would otherwise fall through every match tier into a stub
+                if attendee.get("self") or attendee.get("resource"):
                     continue
 
-                entity, reason = _match_attendee(attendee, email_index)
+                entity, reason = _match_attendee(attendee, attendee_index)
 
                 if entity:
                     result.matched_contacts += 1
-                    _attach_meeting_to_contact(entity, meeting, reason)
+                    _attach_meeting_to_contact(
+                        entity, meeting, reason, profile_cache, attached_at,
+                    )
                     logger.debug(
                         "Matched %s to contact %s (%s)",
                         attendee.get("email"), entity.name, reason,
                     )
                 else:
                     # Create stub for unknown attendee
-                    stub = _create_contact_stub(attendee, session)
-                    _attach_meeting_to_contact(stub, meeting, "new_stub")
+                    stub = _create_contact_stub(attendee)
+                    pending_stubs.append(stub)
+                    _attach_meeting_to_contact(
+                        stub, meeting, "new_stub", profile_cache, attached_at,
+                    )
                     result.created_stubs += 1
                     # Add to index for dedup within this run
-                    email_index[attendee["email"].lower()] = stub
+                    attendee_index.add(stub)
 
                     result.unmatched_attendees.append({
                         "email": attendee.get("email", ""),
@@ -240,6 +338,8 @@ def run_calendar_ingest(days: int = 7) -> CalendarIngestResult:
                         attendee.get("email"), attendee.get("name"),
                     )
 
+        _flush_profiles(profile_cache)
+        session.add_all(pending_stubs)
         session.commit()
         logger.info(
             "Calendar ingest complete: %d events, %d matched, %d stubs created",
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from datetime import datetime
 
 from app.clients.fireflies import FirefliesClient
 from app.models import NormalizedTranscript, TranscriptSentence
-from app.store.database import SourceRecord, get_session, init_db
+from app.store.database import SourceRecord, get_session, init_db, upsert_source_record
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
@@ -31,16 +31,6 @@ def normalize_transcript(raw: dict) -> NormalizedTranscript:
     summary_obj = raw.get("summary") or {}
     sentences_raw = raw.get("sentences") or []
 
-    sentences = [
-        TranscriptSentence(
-            speaker=s.get("speaker_name"),
-            text=s.get("text", ""),
-            start_time=s.get("start_time"),
-            end_time=s.get("end_time"),
-        )
-        for s in sentences_raw
-    ]
-
     action_items = summary_obj.get("action_items") or []
     if isinstance(action_items, str):
         action_items = [line.strip("- ").strip() for line in action_items.split("\n") if line.strip()]
@@ -70,56 +60,74 @@ def normalize_transcript(raw: dict) -> NormalizedTranscript:
         participants=participants,
         summary=summary,
         action_items=action_items,
-        sentences=sentences,
+        # Raw sentence dicts are validated in one pydantic-core pass
+        sentences=sentences_raw,
         raw_json=raw,
     )
 
 
+def _transcript_body(sentences: list[TranscriptSentence]) -> str:
+    """Render sentences as ``Speaker: text`` lines.
+
+    Joining a list (rather than a generator) lets ``str.join`` size the
+    output in one pass; plain concatenation skips f-string formatting.
+    """
+    return "\n".join([(s.speaker or "Unknown") + ": " + s.text for s in sentences])
+
+
+def _upsert_transcript(
+    session, normalized: NormalizedTranscript, entity_id: int | None = None,
+) -> SourceRecord:
+    """Insert or update a transcript row in *session* without committing."""
+    update = {
+        # raw_json has its own column; don't serialize the payload twice
+        "normalized_json": normalized.model_dump_json(exclude={"raw_json"}),
+        "raw_json": jsonio.dumps(normalized.raw_json) if normalized.raw_json else None,
+        "summary": normalized.summary,
+        "action_items": jsonio.dumps(normalized.action_items),
+        "date": normalized.date,
+        "title": normalized.title,
+        "participants": jsonio.dumps(normalized.participants),
+    }
+    if entity_id:
+        update["entity_id"] = entity_id
+
+    # Extract transcript_url for deep-linking in citations
+    transcript_url = None
+    if normalized.raw_json:
+        transcript_url = normalized.raw_json.get("transcript_url")
+
+    values = {
+        **update,
+        "source_type": "fireflies",
+        "source_id": normalized.source_id,
+        "entity_id": entity_id,
+        "body": _transcript_body(normalized.sentences),
+        "link": transcript_url,
+    }
+    return upsert_source_record(session, values, update)
+
+
 def store_transcript(normalized: NormalizedTranscript, entity_id: int | None = None) -> SourceRecord:
     """Persist a normalised transcript to the database."""
+    return store_transcripts([normalized], entity_id=entity_id)[0]
+
+
+def store_transcripts(
+    transcripts: list[NormalizedTranscript], entity_id: int | None = None,
+) -> list[SourceRecord]:
+    """Persist many transcripts in a single session and transaction."""
     init_db()
     session = get_session()
+    # Keep the returned rows readable after commit without a refresh per row
+    session.expire_on_commit = False
     try:
-        existing = session.query(SourceRecord).filter_by(source_id=normalized.source_id).first()
-        if existing:
-            existing.normalized_json = normalized.model_dump_json()
-            existing.raw_json = json.dumps(normalized.raw_json) if normalized.raw_json else None
-            existing.summary = normalized.summary
-            existing.action_items = json.dumps(normalized.action_items)
-            existing.date = normalized.date
-            existing.title = normalized.title
-            existing.participants = json.dumps(normalized.participants)
-            if entity_id:
-                existing.entity_id = entity_id
-            session.commit()
-            session.refresh(existing)
-            return existing
-
-        # Extract transcript_url for deep-linking in citations
-        transcript_url = None
-        if normalized.raw_json:
-            transcript_url = normalized.raw_json.get("transcript_url")
-
-        record = SourceRecord(
-            source_type="fireflies",
-            source_id=normalized.source_id,
-            entity_id=entity_id,
-            title=normalized.title,
-            date=normalized.date,
-            participants=json.dumps(normalized.participants),
-            summary=normalized.summary,
-            action_items=json.dumps(normalized.action_items),
-            body="\n".join(
-                f"{s.speaker or 'Unknown'}: {s.text}" for s in normalized.sentences
-            ),
-            raw_json=json.dumps(normalized.raw_json) if normalized.raw_json else None,
-            normalized_json=normalized.model_dump_json(),
-            link=transcript_url,
-        )
-        session.add(record)
+        records = [_upsert_transcript(session, normalized, entity_id) for normalized in transcripts]
         session.commit()
-        session.refresh(record)
-        return record
+        return records
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
 
@@ -139,12 +147,9 @@ async def ingest_fireflies_for_person(
     )
     logger.info("Fireflies: fetched %d transcripts for %s / %s", len(raw_transcripts), email, name)
 
-    records = []
-    for raw in raw_transcripts:
-        normalized = normalize_transcript(raw)
-        record = store_transcript(normalized, entity_id=entity_id)
-        records.append(record)
-    return records
+    normalized = [normalize_transcript(raw) for raw in raw_transcripts]
+    # One transaction, written off the event loop
+    return await asyncio.to_thread(store_transcripts, normalized, entity_id)
 
 
 def ingest_fireflies_sync(
@@ -2,31 +2,63 @@
 
 from __future__ import annotations
 
-import json
 import logging
-from email.utils import parsedate_to_datetime
+import re
+from datetime import datetime
+from email.utils import getaddresses, parsedate_to_datetime
+from functools import lru_cache
 
 from app.clients.gmail import GmailClient
 from app.models import NormalizedEmail
-from app.store.database import SourceRecord, get_session, init_db
+from app.store.database import SourceRecord, get_session, init_db, upsert_source_record
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
 
+# Non-standard senders occasionally emit ISO 8601 instead of RFC 2822
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_email_date(value: str) -> datetime | None:
+    """Parse a Date header, memoized since auto-sync re-reads the same messages.
+
+    ISO 8601 values take the C-implemented ``datetime.fromisoformat`` path;
+    everything else goes through ``parsedate_to_datetime``.
+    """
+    try:
+        if _ISO_DATE_RE.match(value):
+            return datetime.fromisoformat(value)
+        return parsedate_to_datetime(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _split_addresses(value: str) -> list[str]:
+    """Split a To/Cc header into ``Name <addr>`` / ``addr`` entries.
+
+    Uses the RFC 5322 parser so commas inside quoted display names
+    ("Doe, Jane" <jane@x.com>) don't split one recipient in two.
+    """
+    if not value:
+        return []
+    return [
+        f"{name} <{addr}>" if name else addr
+        for name, addr in getaddresses([value])
+        if addr
+    ]
+
+
 def normalize_email(raw: dict) -> NormalizedEmail:
     """Convert a raw Gmail API message into our normalised model."""
     headers = GmailClient.extract_headers(raw)
     body = GmailClient.extract_body(raw)
 
-    date = None
-    if headers.get("date"):
-        try:
-            date = parsedate_to_datetime(headers["date"])
-        except (ValueError, TypeError):
-            pass
+    date = _parse_email_date(headers["date"]) if headers.get("date") else None
 
-    to_addrs = [a.strip() for a in headers.get("to", "").split(",") if a.strip()]
-    cc_addrs = [a.strip() for a in headers.get("cc", "").split(",") if a.strip()]
+    to_addrs = _split_addresses(headers.get("to", ""))
+    cc_addrs = _split_addresses(headers.get("cc", ""))
 
     return NormalizedEmail(
         source_id=raw.get("id", ""),
@@ -43,43 +75,53 @@ def normalize_email(raw: dict) -> NormalizedEmail:
     )
 
 
+def _upsert_email(
+    session, normalized: NormalizedEmail, entity_id: int | None = None,
+) -> SourceRecord:
+    """Insert or update an email row in *session* without committing."""
+    all_participants = [normalized.from_address or ""] + normalized.to_addresses
+    update = {
+        # raw_json has its own column; don't serialize the payload twice
+        "normalized_json": normalized.model_dump_json(exclude={"raw_json"}),
+        "summary": normalized.subject,
+        "date": normalized.date,
+        "title": normalized.subject,
+        "participants": jsonio.dumps([p for p in all_participants if p]),
+        "body": normalized.body_plain,
+    }
+    if entity_id:
+        update["entity_id"] = entity_id
+
+    values = {
+        **update,
+        "source_type": "gmail",
+        "source_id": normalized.source_id,
+        "entity_id": entity_id,
+        "raw_json": jsonio.dumps(normalized.raw_json) if normalized.raw_json else None,
+    }
+    return upsert_source_record(session, values, update)
+
+
 def store_email(normalized: NormalizedEmail, entity_id: int | None = None) -> SourceRecord:
     """Persist a normalised email to the database."""
+    return store_emails([normalized], entity_id=entity_id)[0]
+
+
+def store_emails(
+    emails: list[NormalizedEmail], entity_id: int | None = None,
+) -> list[SourceRecord]:
+    """Persist many emails in a single session and transaction."""
     init_db()
     session = get_session()
+    # Keep the returned rows readable after commit without a refresh per row
+    session.expire_on_commit = False
     try:
-        existing = session.query(SourceRecord).filter_by(source_id=normalized.source_id).first()
-        if existing:
-            existing.normalized_json = normalized.model_dump_json()
-            existing.summary = normalized.subject
-            existing.date = normalized.date
-            existing.title = normalized.subject
-            all_participants = [normalized.from_address or ""] + normalized.to_addresses
-            existing.participants = json.dumps([p for p in all_participants if p])
-            existing.body = normalized.body_plain
-            if entity_id:
-                existing.entity_id = entity_id
-            session.commit()
-            session.refresh(existing)
-            return existing
-
-        all_participants = [normalized.from_address or ""] + normalized.to_addresses
-        record = SourceRecord(
-            source_type="gmail",
-            source_id=normalized.source_id,
-            entity_id=entity_id,
-            title=normalized.subject,
-            date=normalized.date,
-            participants=json.dumps([p for p in all_participants if p]),
-            summary=normalized.subject,
-            body=normalized.body_plain,
-            raw_json=json.dumps(normalized.raw_json) if normalized.raw_json else None,
-            normalized_json=normalized.model_dump_json(),
-        )
-        session.add(record)
+        records = [_upsert_email(session, normalized, entity_id) for normalized in emails]
         session.commit()
-        session.refresh(record)
-        return record
+        return records
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
 
@@ -95,12 +137,7 @@ def ingest_gmail_for_person(
     raw_messages = client.search_by_person(email=email, name=name, since_days=since_days)
     logger.info("Gmail: fetched %d messages for %s / %s", len(raw_messages), email, name)
 
-    records = []
-    for raw in raw_messages:
-        normalized = normalize_email(raw)
-        record = store_email(normalized, entity_id=entity_id)
-        records.append(record)
-    return records
+    return store_emails([normalize_email(raw) for raw in raw_messages], entity_id=entity_id)
 
 
 def ingest_gmail_for_company(
@@ -116,9 +153,4 @@ def ingest_gmail_for_company(
     )
     logger.info("Gmail: fetched %d messages for company %s / %s", len(raw_messages), domain, company_name)
 
-    records = []
-    for raw in raw_messages:
-        normalized = normalize_email(raw)
-        record = store_email(normalized, entity_id=entity_id)
-        records.append(record)
-    return records
+    return store_emails([normalize_email(raw) for raw in raw_messages], entity_id=entity_id)
@@ -11,10 +11,12 @@ Does NOT store full raw email bodies in UI-facing data.
 
 from __future__ import annotations
 
-import json
 import logging
 import re
+from bisect import bisect_right
+
 from app.store.database import EntityRecord, get_session
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
@@ -26,33 +28,66 @@ COMMITMENT_KEYWORDS = [
     "let me know", "get back to you", "circle back",
 ]
 
+# All keywords as one alternation so a single C-level scan finds every hit
+_COMMIT_RE = re.compile(
+    "|".join(re.escape(kw) for kw in COMMITMENT_KEYWORDS), re.IGNORECASE
+)
+
+# Candidate sentences: runs of text between sentence/line breaks
+_SENTENCE_RE = re.compile(r"[^.!?\n]+")
+
+
+def _sentence_spans(text: str) -> list[tuple[int, int]]:
+    """Return (start, end) offsets of stripped sentences 10-200 chars long."""
+    spans = []
+    for m in _SENTENCE_RE.finditer(text):
+        raw = m.group()
+        stripped = raw.strip()
+        if 10 <= len(stripped) <= 200:
+            start = m.start() + (len(raw) - len(raw.lstrip()))
+            spans.append((start, start + len(stripped)))
+    return spans
+
 
 def _extract_commitments(text: str) -> list[str]:
-    """Extract potential open commitments from email text using keyword detection."""
-    if not text:
+    """Extract potential open commitments from email text using keyword detection.
+
+    Sentence boundaries are located once, then a single case-insensitive pass
+    of ``_COMMIT_RE`` over the body maps each hit back to its enclosing sentence.
+    """
+    # Too short to hold a qualifying sentence, or no keyword anywhere (the
+    # common case): skip sentence splitting entirely
+    if not text or len(text) < 10:
         return []
+    first = _COMMIT_RE.search(text)
+    if first is None:
+        return []
+
+    spans = _sentence_spans(text)
+    if not spans:
+        return []
+
+    starts = [start for start, _ in spans]
+    flagged = set()
+    for m in _COMMIT_RE.finditer(text, first.start()):
+        i = bisect_right(starts, m.start()) - 1
+        if i >= 0 and m.start() < spans[i][1]:
+            flagged.add(i)
 
-    commitments = []
-    sentences = re.split(r"[.!?\n]", text)
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence or len(sentence) < 10 or len(sentence) > 200:
-            continue
-        sentence_lower = sentence.lower()
-        for kw in COMMITMENT_KEYWORDS:
-            if kw in sentence_lower:
-                commitments.append(sentence)
-                break
-
-    # Deduplicate and limit
-    seen = set()
-    unique = []
+    commitments = [text[spans[i][0]:spans[i][1]] for i in sorted(flagged)]
+    return _dedupe_commitments(commitments)
+
+
+def _dedupe_commitments(commitments: list[str], limit: int = 5) -> list[str]:
+    """Keep the first spelling of each case-insensitive commitment, up to *limit*."""
+    unique: dict[str, str] = {}
     for c in commitments:
-        key = c.lower().strip()
-        if key not in seen:
-            seen.add(key)
-            unique.append(c)
-    return unique[:5]
+        unique.setdefault(c.lower().strip(), c)
+    return list(unique.values())[:limit]
+
+
+# Newlines become spaces and carriage returns are dropped, in one pass
+_SNIPPET_WS = str.maketrans({"\n": " ", "\r": None})
 
 
 def _summarize_thread(subject: str, body_snippet: str) -> str:
@@ -62,7 +97,7 @@ def _summarize_thread(subject: str, body_snippet: str) -> str:
         parts.append(f"Subject: {subject}")
     if body_snippet:
         # Take first 200 chars of body, clean up
-        clean = body_snippet[:200].replace("\n", " ").replace("\r", "").strip()
+        clean = body_snippet[:200].translate(_SNIPPET_WS).strip()
         if clean:
             parts.append(clean)
     return " | ".join(parts) if parts else "No content available"
@@ -94,42 +129,52 @@ class MeetingEnrichmentResult:
         }
 
 
+def _search_contact_threads(gmail_client, attendee_email: str) -> list[dict]:
+    """Fetch the most recent threads exchanged with *attendee_email*."""
+    return gmail_client.search_messages(
+        query=f"from:{attendee_email} OR to:{attendee_email}",
+        max_results=5,
+    )
+
+
 def enrich_meeting_context(
     attendee_email: str,
     meeting_id: str = "",
     gmail_client=None,
+    threads: list[dict] | None = None,
 ) -> MeetingEnrichmentResult:
     """Enrich a single meeting attendee with Gmail context.
 
     Fetches:
     1. Calendar invite threads (subject contains "Invitation:")
     2. Last 5 threads in last 180 days with this email address
+
+    Pass *threads* to reuse an earlier search for the same address and skip
+    the Gmail call entirely.
     """
     result = MeetingEnrichmentResult(
         meeting_id=meeting_id,
         attendee_email=attendee_email,
     )
 
-    if not gmail_client:
+    if threads is None:
+        if not gmail_client:
+            try:
+                from app.clients.gmail import GmailClient
+                gmail_client = GmailClient()
+            except Exception as e:
+                result.error = f"Gmail client init failed: {e}"
+                logger.warning("Gmail enrichment skipped: %s", e)
+                return result
+
+        # Fetch recent threads with this contact
         try:
-            from app.clients.gmail import GmailClient
-            gmail_client = GmailClient()
-        except Exception as e:
-            result.error = f"Gmail client init failed: {e}"
-            logger.warning("Gmail enrichment skipped: %s", e)
+            threads = _search_contact_threads(gmail_client, attendee_email)
+        except Exception:
+            logger.exception("Gmail search failed for %s", attendee_email)
+            result.error = "Gmail search failed"
             return result
 
-    # Fetch recent threads with this contact
-    try:
-        threads = gmail_client.search_messages(
-            query=f"from:{attendee_email} OR to:{attendee_email}",
-            max_results=5,
-        )
-    except Exception:
-        logger.exception("Gmail search failed for %s", attendee_email)
-        result.error = "Gmail search failed"
-        return result
-
     result.thread_count = len(threads)
 
     if not threads:
@@ -169,14 +214,7 @@ def enrich_meeting_context(
         result.snippet = "Email threads found but no content extractable"
 
     # Deduplicate commitments
-    seen = set()
-    unique_commitments = []
-    for c in all_commitments:
-        key = c.lower().strip()
-        if key not in seen:
-            seen.add(key)
-            unique_commitments.append(c)
-    result.open_commitments = unique_commitments[:5]
+    result.open_commitments = _dedupe_commitments(all_commitments)
 
     # Confidence: higher with more data
     result.confidence_score = min(1.0, 0.3 + (len(threads) * 0.14))
@@ -184,21 +222,29 @@ def enrich_meeting_context(
     return result
 
 
-def enrich_all_upcoming_meetings() -> list[dict]:
+def enrich_all_upcoming_meetings(gmail_client=None) -> list[dict]:
     """Run Gmail enrichment for all upcoming meetings across all contacts.
 
+    Gmail is searched at most once per distinct attendee email; every meeting
+    for that address reuses the cached threads.
+
     Returns a list of enrichment result dicts.
     """
     session = get_session()
     enrichments = []
+    threads_by_email: dict[str, list[dict]] = {}
+    gmail_init_error = ""
 
     try:
+        # Prefilter in SQL on the serialized key so contacts without any
+        # meetings are never loaded or parsed; the JSON check below is exact.
         entities = session.query(EntityRecord).filter(
-            EntityRecord.entity_type == "person"
+            EntityRecord.entity_type == "person",
+            EntityRecord.domains.contains('"upcoming_meetings"'),
         ).all()
 
         for entity in entities:
-            profile_data = json.loads(entity.domains or "{}")
+            profile_data = jsonio.loads(entity.domains or "{}")
             upcoming = profile_data.get("upcoming_meetings", [])
             if not upcoming:
                 continue
@@ -209,12 +255,39 @@ def enrich_all_upcoming_meetings() -> list[dict]:
 
             primary_email = emails[0]
 
+            if gmail_client is None and not gmail_init_error:
+                try:
+                    from app.clients.gmail import GmailClient
+                    gmail_client = GmailClient()
+                except Exception as e:
+                    # Tried once per run; each meeting records the error below
+                    gmail_init_error = f"Gmail client init failed: {e}"
+                    logger.warning("Gmail enrichment skipped: %s", e)
+
+            if primary_email not in threads_by_email and gmail_client is not None:
+                try:
+                    threads_by_email[primary_email] = _search_contact_threads(
+                        gmail_client, primary_email,
+                    )
+                except Exception:
+                    # Not cached: enrich_meeting_context retries and records the error
+                    logger.exception("Gmail search failed for %s", primary_email)
+
             for meeting in upcoming:
                 meeting_id = meeting.get("calendar_event_id", "")
-                result = enrich_meeting_context(
-                    attendee_email=primary_email,
-                    meeting_id=meeting_id,
-                )
+                if gmail_init_error:
+                    result = MeetingEnrichmentResult(
+                        meeting_id=meeting_id,
+                        attendee_email=primary_email,
+                    )
+                    result.error = gmail_init_error
+                else:
+                    result = enrich_meeting_context(
+                        attendee_email=primary_email,
+                        meeting_id=meeting_id,
+                        gmail_client=gmail_client,
+                        threads=threads_by_email.get(primary_email),
+                    )
                 enrichments.append(result.to_dict())
 
                 # Store enrichment on the meeting record
@@ -222,10 +295,13 @@ def enrich_all_upcoming_meetings() -> list[dict]:
 
             # Update profile data with enriched meetings
             profile_data["upcoming_meetings"] = upcoming
-            entity.domains = json.dumps(profile_data)
+            entity.domains = jsonio.dumps(profile_data)
 
         session.commit()
-        logger.info("Enriched %d meeting-contact pairs", len(enrichments))
+        logger.info(
+            "Enriched %d meeting-contact pairs (%d Gmail searches)",
+            len(enrichments), len(threads_by_email),
+        )
 
     except Exception:
         session.rollback()
@@ -12,9 +12,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Literal, Optional
+from weakref import WeakValueDictionary
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, AliasChoices, BaseModel, ConfigDict, Field
 
 
 # ---------------------------------------------------------------------------
@@ -85,8 +86,14 @@ class RetrievalLedgerRow(BaseModel):
     result_count: int = 0
 
 
+# Live Citation instances keyed by their constructor arguments; see Citation.intern
+_CITATION_INTERN: WeakValueDictionary[tuple, Citation] = WeakValueDictionary()
+
+
 class Citation(BaseModel):
     """Pointer back to the evidence behind a claim."""
+    model_config = ConfigDict(frozen=True)
+
     source_type: SourceType
     source_id: str = Field(..., description="Fireflies transcript ID or Gmail message ID")
     timestamp: datetime
@@ -96,12 +103,37 @@ class Citation(BaseModel):
     excerpt_start: Optional[int] = Field(None, description="Start char offset in source")
     excerpt_end: Optional[int] = Field(None, description="End char offset in source")
 
+    @classmethod
+    def intern(cls, **fields) -> Citation:
+        """Return the shared Citation for *fields*, building it on first use.
+
+        The same excerpt is often cited from several brief sections; interning
+        lets them share one frozen instance and skips re-validation on a hit.
+        """
+        key = tuple(sorted(fields.items()))
+        citation = _CITATION_INTERN.get(key)
+        if citation is None:
+            citation = _CITATION_INTERN[key] = cls(**fields)
+        return citation
+
+
+def _dedupe_citations(citations: list[Citation]) -> list[Citation]:
+    """Drop repeated citations, keeping first-seen order."""
+    # Frozen citations hash by value; interned ones also short-circuit on identity
+    return list(dict.fromkeys(citations))
+
+
+# A claim's citation list, with duplicates pulled in by different sections removed
+CitationList = Annotated[list[Citation], AfterValidator(_dedupe_citations)]
+
 
 class TaggedClaim(BaseModel):
     """A single claim with evidence discipline tagging."""
+    model_config = ConfigDict(frozen=True)
+
     claim: str
     evidence_tag: EvidenceTag = EvidenceTag.unknown
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 # ---------------------------------------------------------------------------
@@ -151,14 +183,14 @@ class RelationshipContext(BaseModel):
     influence_level_inferred: bool = False
     relationship_health: Optional[str] = None
     relationship_health_inferred: bool = False
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class InteractionRecord(BaseModel):
     date: Optional[datetime] = None
     summary: str
     commitments: list[str] = Field(default_factory=list)
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class OpenLoop(BaseModel):
@@ -166,19 +198,19 @@ class OpenLoop(BaseModel):
     owner: Optional[str] = None
     due_date: Optional[str] = None
     status: str = "open"
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class Watchout(BaseModel):
     description: str
-    severity: str = "medium"  # low | medium | high
-    citations: list[Citation] = Field(default_factory=list)
+    severity: Literal["low", "medium", "high"] = "medium"
+    citations: CitationList = Field(default_factory=list)
 
 
 class MeetingObjective(BaseModel):
     objective: str
     measurable_outcome: str
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class LeveragePlan(BaseModel):
@@ -186,22 +218,20 @@ class LeveragePlan(BaseModel):
     proof_points: list[str] = Field(default_factory=list, max_length=2)
     tension_to_surface: Optional[str] = None
     ask: Optional[str] = None
-    citations: list[Citation] = Field(default_factory=list)
-
-
-class AgendaVariant(BaseModel):
-    duration_minutes: int
-    blocks: list[AgendaBlock] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class AgendaBlock(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     minutes: int
     label: str
     notes: Optional[str] = None
 
 
-# Forward-ref fix (AgendaVariant references AgendaBlock defined after it)
-AgendaVariant.model_rebuild()
+class AgendaVariant(BaseModel):
+    duration_minutes: int
+    blocks: list[AgendaBlock] = Field(default_factory=list)
 
 
 class Agenda(BaseModel):
@@ -209,6 +239,8 @@ class Agenda(BaseModel):
 
 
 class EvidenceItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     source_type: SourceType
     source_id: str
     title: Optional[str] = None
@@ -249,7 +281,7 @@ class CognitivePattern(BaseModel):
     observation: str
     evidence_quote: Optional[str] = None
     evidence_tag: EvidenceTag = EvidenceTag.unknown
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class StrategicTension(BaseModel):
@@ -257,7 +289,7 @@ class StrategicTension(BaseModel):
     tension: str
     evidence: str
     evidence_tag: EvidenceTag = EvidenceTag.unknown
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class BehavioralForecast(BaseModel):
@@ -265,7 +297,7 @@ class BehavioralForecast(BaseModel):
     scenario: str = Field(..., description="If X happens")
     predicted_reaction: str = Field(..., description="Likely reaction")
     reasoning: str = Field(..., description="Evidence-backed reasoning")
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class InformationGap(BaseModel):
@@ -306,21 +338,21 @@ class WhatToCoverItem(BaseModel):
     """A specific evidence-backed agenda item for the upcoming call."""
     item: str
     rationale: str = ""
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class LeverageQuestion(BaseModel):
     """A leverage question with upstream evidence citation."""
     question: str
     rationale: str = ""
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class ProofPoint(BaseModel):
     """A proof point to deploy, citing why it matters to them."""
     point: str
     why_it_matters: str = ""
-    citations: list[Citation] = Field(default_factory=list)
+    citations: CitationList = Field(default_factory=list)
 
 
 class EvidenceIndexEntry(BaseModel):
@@ -480,6 +512,19 @@ class BriefOutput(BaseModel):
 # Internal data models (normalised artifacts)
 # ---------------------------------------------------------------------------
 
+class TranscriptSentence(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # Accepts Fireflies' raw ``speaker_name`` key so ingest can hand the API's
+    # sentence dicts straight to pydantic-core without a per-sentence rebuild.
+    speaker: Optional[str] = Field(
+        None, validation_alias=AliasChoices("speaker", "speaker_name")
+    )
+    text: str = ""
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
 class NormalizedTranscript(BaseModel):
     """Normalised representation of a Fireflies transcript."""
     source_id: str
@@ -493,16 +538,6 @@ class NormalizedTranscript(BaseModel):
     raw_json: Optional[dict] = None
 
 
-class TranscriptSentence(BaseModel):
-    speaker: Optional[str] = None
-    text: str
-    start_time: Optional[float] = None
-    end_time: Optional[float] = None
-
-
-NormalizedTranscript.model_rebuild()
-
-
 class NormalizedEmail(BaseModel):
     """Normalised representation of a Gmail message."""
     source_id: str
@@ -6,47 +6,166 @@ Uses a simple chunking strategy: split body text into ~500-token chunks.
 
 from __future__ import annotations
 
-import json
+import base64
 import logging
+import math
+import sys
+from array import array
+from collections.abc import Iterator
+from itertools import islice
+
+from sqlalchemy import insert
 
 from app.clients.openai_client import EmbeddingClient
 from app.config import settings
-from app.store.database import EmbeddingRecord, SourceRecord, get_session, init_db
+from app.store.database import (
+    EmbeddingRecord,
+    SourceRecord,
+    get_session,
+    init_db,
+    pgvector_available,
+)
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE_CHARS = 2000  # ~500 tokens
 
 
+def pack_embedding(vector: list[float]) -> str:
+    """Encode *vector* for the embeddings column.
+
+    Normally base64 float32 (little-endian): roughly a third the size of
+    the JSON form, and decoded with a single ``array.frombytes`` instead of
+    a JSON parse. When pgvector is available the column may have been
+    converted to ``vector(1536)`` by migration 003, which only accepts the
+    ``'[...]'`` text form, so the JSON list is written instead.
+    """
+    if pgvector_available():
+        return jsonio.dumps(list(vector))
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def unit_vector(vector: list[float]) -> list[float]:
+    """Scale *vector* to length 1 so cosine similarity is a plain dot product.
+
+    A zero vector is returned unchanged.
+    """
+    norm = math.hypot(*vector)
+    if norm == 0 or norm == 1:
+        return vector
+    return [x / norm for x in vector]
+
+
+def unpack_embedding(value: str) -> array | list[float]:
+    """Decode a stored embedding: base64 float32, or a JSON list for pgvector
+    databases and rows written before packing.
+
+    Raises ``ValueError`` for malformed input.
+    """
+    if value.startswith("["):
+        return jsonio.loads(value)
+    vector = array("f")
+    vector.frombytes(base64.b64decode(value, validate=True))
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector
+
+
 def chunk_text(text: str, chunk_size: int = CHUNK_SIZE_CHARS) -> list[str]:
-    """Split text into chunks by character count, breaking at sentence boundaries."""
+    """Split text into chunks by character count, breaking at sentence boundaries.
+
+    Sentences are runs between ". " separators. Sentence offsets are scanned
+    once and each chunk is sliced straight out of the text; a chunk closed
+    early ends on the period of its last sentence.
+    """
     if not text:
         return []
-    sentences = text.replace("\n", " ").split(". ")
+    text = text.replace("\n", " ")
     chunks: list[str] = []
-    current: list[str] = []
-    current_len = 0
+    chunk_start = 0  # offset where the pending chunk begins
+    current_len = 0  # sentence chars in the pending chunk, separators excluded
+    sentence_start = 0
 
-    for sentence in sentences:
-        if current_len + len(sentence) > chunk_size and current:
-            chunks.append(". ".join(current) + ".")
-            current = []
+    while True:
+        sep = text.find(". ", sentence_start)
+        sentence_end = len(text) if sep == -1 else sep
+        length = sentence_end - sentence_start
+        if current_len + length > chunk_size and sentence_start > chunk_start:
+            # Close the pending chunk, keeping the period before the separator
+            chunks.append(text[chunk_start:sentence_start - 1])
+            chunk_start = sentence_start
             current_len = 0
-        current.append(sentence)
-        current_len += len(sentence)
-
-    if current:
-        chunks.append(". ".join(current))
+        current_len += length
+        if sep == -1:
+            break
+        sentence_start = sep + 2
 
+    chunks.append(text[chunk_start:])
     return chunks
 
 
+# Chunks sent per embeddings request by embed_all_pending
+EMBED_BATCH_SIZE = 256
+
+# Pending source records loaded per query by embed_all_pending
+_PENDING_PAGE_SIZE = 200
+
+
+def _embedding_row(record_id: int, index: int, chunk: str, vector: list[float]) -> dict:
+    """Column values for one embeddings row."""
+    return {
+        "source_record_id": record_id,
+        "chunk_index": index,
+        "chunk_text": chunk,
+        "embedding": pack_embedding(unit_vector(vector)),
+        "model": settings.openai_embedding_model,
+    }
+
+
+def _insert_embeddings(session, rows: list[dict]) -> None:
+    """Write *rows* with one Core executemany INSERT, bypassing the ORM unit of work."""
+    if rows:
+        session.execute(insert(EmbeddingRecord), rows)
+
+
+def _embed_record(session, record: SourceRecord) -> int:
+    """Add embedding rows for *record* to *session* without committing.
+
+    Returns the number of chunks embedded (0 if there is no text or the
+    embedding call fails).
+    """
+    text = record.body or record.summary or ""
+    if not text.strip():
+        return 0
+
+    chunks = chunk_text(text)
+    if not chunks:
+        return 0
+
+    try:
+        client = EmbeddingClient()
+        vectors = client.embed(chunks)
+    except Exception:
+        logger.exception("Failed to generate embeddings for record %d", record.id)
+        return 0
+
+    _insert_embeddings(session, [
+        _embedding_row(record.id, i, chunk, vector)
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+    ])
+    return len(chunks)
+
+
 def embed_source_record(record_id: int) -> int:
     """Generate embeddings for a single source record. Returns count of chunks embedded."""
     init_db()
     session = get_session()
     try:
-        record = session.query(SourceRecord).get(record_id)
+        record = session.get(SourceRecord, record_id)
         if not record:
             logger.warning("Source record %d not found", record_id)
             return 0
@@ -56,49 +175,111 @@ def embed_source_record(record_id: int) -> int:
         if existing > 0:
             return existing
 
-        text = record.body or record.summary or ""
-        if not text.strip():
-            return 0
+        count = _embed_record(session, record)
+        if count:
+            session.commit()
+        return count
+    finally:
+        session.close()
 
-        chunks = chunk_text(text)
-        if not chunks:
-            return 0
 
-        try:
-            client = EmbeddingClient()
-            vectors = client.embed(chunks)
-        except Exception:
-            logger.exception("Failed to generate embeddings for record %d", record_id)
-            return 0
+def _embed_batch(client, batch: list[tuple[int, int, str]], failed: set[int]) -> list[dict]:
+    """Embed one batch of ``(record_id, chunk_index, chunk)`` in a single request.
 
-        for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
-            emb = EmbeddingRecord(
-                source_record_id=record_id,
-                chunk_index=i,
-                chunk_text=chunk,
-                embedding=json.dumps(vector),
-                model=settings.openai_embedding_model,
-            )
-            session.add(emb)
+    Returns the embeddings rows. If the request fails, every record with a
+    chunk in the batch is added to *failed* and no rows are returned.
+    """
+    try:
+        vectors = client.embed([chunk for _, _, chunk in batch])
+    except Exception:
+        logger.exception("Failed to generate embeddings for a batch of %d chunks", len(batch))
+        failed.update(record_id for record_id, _, _ in batch)
+        return []
+    return [
+        _embedding_row(record_id, index, chunk, vector)
+        for (record_id, index, chunk), vector in zip(batch, vectors)
+    ]
 
-        session.commit()
-        return len(chunks)
-    finally:
-        session.close()
+
+def _pending_chunks(session, record_ids: list[int]) -> Iterator[tuple[int, int, str]]:
+    """Yield ``(record_id, chunk_index, chunk)`` for *record_ids*, a page at a time.
+
+    Each page is read in full before its chunks are yielded, so the caller
+    may commit between items.
+    """
+    for start in range(0, len(record_ids), _PENDING_PAGE_SIZE):
+        page = record_ids[start:start + _PENDING_PAGE_SIZE]
+        # Only the columns chunking needs, not hydrated ORM rows
+        records = (
+            session.query(SourceRecord.id, SourceRecord.body, SourceRecord.summary)
+            .filter(SourceRecord.id.in_(page))
+            .order_by(SourceRecord.id)
+            .all()
+        )
+        for record_id, body, summary in records:
+            text = body or summary or ""
+            if text.strip():
+                for i, chunk in enumerate(chunk_text(text)):
+                    yield record_id, i, chunk
 
 
-def embed_all_pending() -> int:
-    """Embed all source records that don't have embeddings yet."""
+def embed_all_pending(batch_size: int = EMBED_BATCH_SIZE) -> int:
+    """Embed all source records that don't have embeddings yet.
+
+    Pending records are found with one anti-join, and their chunks are
+    pooled so the embeddings API is called once per *batch_size* chunks
+    rather than once per record. After each batch the rows of every record
+    whose chunks are all embedded are committed, which bounds memory and
+    keeps finished work if a later batch or write fails. A record whose
+    chunks land in a failed batch gets no rows at all, so it stays pending
+    for the next run.
+    """
     init_db()
     session = get_session()
     try:
-        # Find records without embeddings
-        records = session.query(SourceRecord).all()
+        pending_ids = [
+            record_id for (record_id,) in (
+                session.query(SourceRecord.id)
+                .outerjoin(EmbeddingRecord, EmbeddingRecord.source_record_id == SourceRecord.id)
+                .filter(EmbeddingRecord.id.is_(None))
+                .order_by(SourceRecord.id)
+            )
+        ]
+        failed: set[int] = set()
+        # Lazy, so chunks of a record that already failed are never sent
+        chunks = (
+            item for item in _pending_chunks(session, pending_ids) if item[0] not in failed
+        )
+        batch = list(islice(chunks, batch_size))
+        if not batch:
+            return 0
+
+        try:
+            client = EmbeddingClient()
+        except Exception:
+            logger.exception("Failed to initialise embedding client")
+            return 0
+
         total = 0
-        for record in records:
-            count = session.query(EmbeddingRecord).filter_by(source_record_id=record.id).count()
-            if count == 0:
-                total += embed_source_record(record.id)
+        ready: list[dict] = []
+        while batch:
+            ready.extend(_embed_batch(client, batch, failed))
+            batch = list(islice(chunks, batch_size))
+            # A record split across batches keeps its rows in *ready* until
+            # its last chunk has been embedded
+            open_id = batch[0][0] if batch else None
+            rows = [
+                row for row in ready
+                if row["source_record_id"] != open_id and row["source_record_id"] not in failed
+            ]
+            ready = [row for row in ready if row["source_record_id"] == open_id]
+            if rows:
+                _insert_embeddings(session, rows)
+                session.commit()
+                total += len(rows)
         return total
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
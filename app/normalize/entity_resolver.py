@@ -6,14 +6,19 @@ Supports "company" search across domains and signature lines.
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 
-from app.store.database import EntityRecord, SourceRecord, get_session, init_db
+from app.store.database import EntityRecord, SourceRecord, contains_any, get_session, init_db
+from app.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
+# Address inside a "Name <addr>" header
+_EMAIL_IN_HEADER_RE = re.compile(r"<([^>]+@[^>]+)>")
+# Any email-shaped token, used to find signature domains in bodies
+_EMAIL_ANY_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+
 
 class ResolvedEntity:
     """Result of entity resolution."""
@@ -37,7 +42,7 @@ class ResolvedEntity:
 
 def _extract_email_from_header(header_value: str) -> str | None:
     """Extract email address from a header like 'John Doe <john@example.com>'."""
-    match = re.search(r"<([^>]+@[^>]+)>", header_value)
+    match = _EMAIL_IN_HEADER_RE.search(header_value)
     if match:
         return match.group(1).lower()
     if "@" in header_value:
@@ -48,7 +53,7 @@ def _extract_email_from_header(header_value: str) -> str | None:
 def _extract_domain(email: str) -> str | None:
     """Extract domain from email address."""
     if "@" in email:
-        return email.split("@")[1].lower()
+        return email.rpartition("@")[2].lower()
     return None
 
 
@@ -61,16 +66,22 @@ def resolve_person(name: str, email: str | None = None) -> ResolvedEntity:
     3. Scan source_records for participant matches to discover aliases/emails
     4. Create a new entity if not found
     """
+    # Lowercased once; the participant scan below tests them per participant
+    name_lc = name.lower()
+    email_lc = email.lower() if email else None
+
     init_db()
     session = get_session()
     try:
         # 1. Try exact email match
         if email:
-            for entity in session.query(EntityRecord).filter(
-                EntityRecord.entity_type == "person"
-            ).all():
+            query = session.query(EntityRecord).filter(EntityRecord.entity_type == "person")
+            prefilter = contains_any([EntityRecord.emails], [email])
+            if prefilter is not None:
+                query = query.filter(prefilter)
+            for entity in query.all():
                 stored_emails = entity.get_emails()
-                if email.lower() in [e.lower() for e in stored_emails]:
+                if any(e.lower() == email_lc for e in stored_emails):
                     return ResolvedEntity(
                         entity_id=entity.id,
                         name=entity.name,
@@ -95,17 +106,23 @@ def resolve_person(name: str, email: str | None = None) -> ResolvedEntity:
 
         # 3. Scan source records for discoveries
         discovered_emails: set[str] = set()
-        discovered_aliases: set[str] = {name.lower()}
+        discovered_aliases: set[str] = {name_lc}
 
         if email:
-            discovered_emails.add(email.lower())
+            discovered_emails.add(email_lc)
 
-        # Look through stored participants
-        for record in session.query(SourceRecord).all():
-            participants = json.loads(record.participants) if record.participants else []
+        # Look through stored participants (only that column, streamed)
+        rows = session.query(SourceRecord.participants)
+        prefilter = contains_any(
+            [SourceRecord.participants], [name] + ([email] if email else []),
+        )
+        if prefilter is not None:
+            rows = rows.filter(prefilter)
+        for (participants_json,) in rows.yield_per(500):
+            participants = jsonio.loads(participants_json) if participants_json else []
             for p in participants:
                 p_lower = p.lower() if isinstance(p, str) else ""
-                if name.lower() in p_lower or (email and email.lower() in p_lower):
+                if name_lc in p_lower or (email_lc and email_lc in p_lower):
                     extracted = _extract_email_from_header(p)
                     if extracted:
                         discovered_emails.add(extracted)
@@ -148,16 +165,23 @@ def resolve_company(company_name: str, domain: str | None = None) -> ResolvedEnt
     3. Scan source_records for domain / signature matches
     4. Create a new entity if not found
     """
+    company_lc = company_name.lower()
+    domain_lc = domain.lower() if domain else None
+    # Case-insensitive body search without lowercasing a copy of every body
+    company_re = re.compile(re.escape(company_name), re.IGNORECASE)
+
     init_db()
     session = get_session()
     try:
         # 1. Domain match
         if domain:
-            for entity in session.query(EntityRecord).filter(
-                EntityRecord.entity_type == "company"
-            ).all():
+            query = session.query(EntityRecord).filter(EntityRecord.entity_type == "company")
+            prefilter = contains_any([EntityRecord.domains], [domain])
+            if prefilter is not None:
+                query = query.filter(prefilter)
+            for entity in query.all():
                 stored_domains = entity.get_domains()
-                if domain.lower() in [d.lower() for d in stored_domains]:
+                if any(d.lower() == domain_lc for d in stored_domains):
                     return ResolvedEntity(
                         entity_id=entity.id,
                         name=entity.name,
@@ -183,24 +207,31 @@ def resolve_company(company_name: str, domain: str | None = None) -> ResolvedEnt
         # 3. Discover domains from source records
         discovered_domains: set[str] = set()
         if domain:
-            discovered_domains.add(domain.lower())
+            discovered_domains.add(domain_lc)
 
-        for record in session.query(SourceRecord).all():
-            participants = json.loads(record.participants) if record.participants else []
+        # Both the domain and the signature checks need the name in one of these
+        rows = session.query(SourceRecord.participants, SourceRecord.body)
+        prefilter = contains_any(
+            [SourceRecord.participants, SourceRecord.body], [company_name],
+        )
+        if prefilter is not None:
+            rows = rows.filter(prefilter)
+        for participants_json, body in rows.yield_per(200):
+            participants = jsonio.loads(participants_json) if participants_json else []
             for p in participants:
                 extracted_email = _extract_email_from_header(str(p))
                 if extracted_email:
                     d = _extract_domain(extracted_email)
-                    if d and company_name.lower() in d:
+                    if d and company_lc in d:
                         discovered_domains.add(d)
             # Also scan body for company name in signatures
-            body = record.body or ""
-            if company_name.lower() in body.lower():
+            body = body or ""
+            if company_re.search(body):
                 # Try to find domain in the same body
-                email_matches = re.findall(r"[\w.+-]+@[\w-]+\.[\w.]+", body)
+                email_matches = _EMAIL_ANY_RE.findall(body)
                 for em in email_matches:
                     d = _extract_domain(em)
-                    if d and company_name.lower() in d:
+                    if d and company_lc in d:
                         discovered_domains.add(d)
 
         # 4. Create new entity
@@ -209,7 +240,7 @@ def resolve_company(company_name: str, domain: str | None = None) -> ResolvedEnt
             entity_type="company",
         )
         new_entity.set_domains(sorted(discovered_domains))
-        new_entity.set_aliases([company_name.lower()])
+        new_entity.set_aliases([company_lc])
         session.add(new_entity)
         session.commit()
         session.refresh(new_entity)
@@ -11,17 +11,81 @@ All results carry source provenance for citation.
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
+import math
+import re
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter, mul
 
 from sqlalchemy import desc
+from sqlalchemy.orm import load_only
 
 from app.config import settings
-from app.store.database import EmbeddingRecord, SourceRecord, get_session, init_db
+from app.normalize.embeddings import unpack_embedding
+from app.store.database import EmbeddingRecord, SourceRecord, contains_any, get_session, init_db
 
 logger = logging.getLogger(__name__)
 
+# Stay well under SQLite's default 999 bound-parameter limit for NOT IN lists
+_MAX_SQL_EXCLUDE_IDS = 900
+
+# SourceRecord columns evidence building reads; raw_json and normalized_json
+# (the largest payloads on the row) stay unloaded
+_EVIDENCE_COLUMNS = (
+    SourceRecord.id,
+    SourceRecord.source_type,
+    SourceRecord.source_id,
+    SourceRecord.title,
+    SourceRecord.date,
+    SourceRecord.participants,
+    SourceRecord.summary,
+    SourceRecord.action_items,
+    SourceRecord.body,
+    SourceRecord.link,
+)
+
+# Bounded pool for query-embedding calls that overlap retrieval DB work
+_EMBED_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="retrieval-embed")
+
+
+CONCERN_KEYWORDS = [
+    "concern", "worried", "risk", "issue", "problem",
+    "objection", "pushback", "blocker", "hesitant",
+    "not sure", "disagree", "budget", "timeline",
+]
+
+# Case-insensitive alternation for bodies whose lowercase form changes length
+_CONCERN_RE = re.compile("|".join(re.escape(kw) for kw in CONCERN_KEYWORDS), re.IGNORECASE)
+
+
+def _first_concern_hits(body: str) -> list[tuple[str, int]]:
+    """Return ``(keyword, offset)`` for the first occurrence of each concern keyword.
+
+    Results keep ``CONCERN_KEYWORDS`` order. Each keyword is located with
+    ``str.find`` on one lowercased copy; CPython's fixed-string search
+    skips ahead through the text and beats a regex alternation, which
+    tries every keyword at every offset, by roughly 10x on long bodies.
+    When lowercasing changes the text's length (a few non-ASCII
+    characters do), its offsets no longer index *body*, so the regex
+    scan is used instead.
+    """
+    lowered = body.lower()
+    if len(lowered) == len(body):
+        hits = [(kw, lowered.find(kw)) for kw in CONCERN_KEYWORDS]
+        return [(kw, idx) for kw, idx in hits if idx >= 0]
+
+    first: dict[str, int] = {}
+    for m in _CONCERN_RE.finditer(body):
+        first.setdefault(m.group().lower(), m.start())
+        if len(first) == len(CONCERN_KEYWORDS):
+            break
+    return [(kw, first[kw]) for kw in CONCERN_KEYWORDS if kw in first]
+
 
 class RetrievedEvidence:
     """Container for all evidence retrieved for brief generation."""
@@ -42,14 +106,58 @@ class RetrievedEvidence:
         return len(self.all_source_records)
 
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
     """Compute cosine similarity between two vectors."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sum(x * x for x in a) ** 0.5
-    norm_b = sum(x * x for x in b) ** 0.5
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    return _cosine_similarities(a, [b])[0]
+
+
+def _cosine_similarities(
+    query: Sequence[float],
+    vectors: list[Sequence[float]],
+    unit_vectors: bool = False,
+) -> list[float]:
+    """Cosine similarity of *query* against each of *vectors*.
+
+    The query norm is computed once for the whole batch. With *unit_vectors*
+    the vectors are known to be length 1 (stored embeddings are normalized
+    at write time), so each score is a single dot product. ``map(mul, ...)``
+    and ``math.hypot`` keep the per-element loops in C rather than in
+    Python generator frames.
+    """
+    query_norm = math.hypot(*query)
+    if query_norm == 0:
+        return [0.0] * len(vectors)
+    if unit_vectors:
+        unit_query = [x / query_norm for x in query]
+        return [sum(map(mul, unit_query, vec)) for vec in vectors]
+    sims = []
+    for vec in vectors:
+        norm = math.hypot(*vec)
+        sims.append(sum(map(mul, query, vec)) / (query_norm * norm) if norm else 0.0)
+    return sims
+
+
+@lru_cache(maxsize=1024)
+def _cached_query_embedding(query: str, model: str) -> tuple[float, ...]:
+    """Embed *query* with *model*, memoized per process.
+
+    The same "person company" query text recurs on every brief for an
+    entity. Failures raise and are therefore never cached.
+    """
+    from app.clients.openai_client import EmbeddingClient
+    vector = EmbeddingClient().embed_single(query)
+    if not vector:
+        raise ValueError("empty embedding")
+    return tuple(vector)
+
+
+def _embed_query(query: str) -> Sequence[float]:
+    """Embed a semantic-search query; an empty result means it failed."""
+    try:
+        return _cached_query_embedding(query, settings.openai_embedding_model)
+    except Exception:
+        logger.debug("Semantic search skipped – embedding failed")
+        return []
 
 
 def _semantic_search(
@@ -59,57 +167,122 @@ def _semantic_search(
     exclude_ids: set[int],
     top_k: int = 10,
     threshold: float = 0.3,
+    query_vec: Sequence[float] | None = None,
 ) -> list[SourceRecord]:
-    """Find source records semantically similar to the query string."""
+    """Find source records semantically similar to the query string.
+
+    Pass *query_vec* to reuse an embedding computed earlier (e.g. in a
+    batch by ``retrieve_for_entities``) instead of embedding *query* here.
+    """
     if not settings.openai_api_key or not query.strip():
         return []
 
-    try:
-        from app.clients.openai_client import EmbeddingClient
-        client = EmbeddingClient()
-        query_vec = client.embed_single(query)
-    except Exception:
-        logger.debug("Semantic search skipped – embedding failed")
-        return []
+    if query_vec is None:
+        query_vec = _embed_query(query)
 
     if not query_vec:
         return []
 
-    embeddings = (
-        session.query(EmbeddingRecord)
+    query_rows = (
+        session.query(EmbeddingRecord.source_record_id, EmbeddingRecord.embedding)
         .join(SourceRecord)
         .filter(SourceRecord.date >= since)
-        .all()
     )
-
-    scored: list[tuple[float, int]] = []
-    for emb in embeddings:
-        if emb.source_record_id in exclude_ids:
+    # Small exclude sets go into SQL so excluded vectors are never fetched;
+    # past SQLite's bound-parameter limit they are filtered below instead
+    if exclude_ids and len(exclude_ids) <= _MAX_SQL_EXCLUDE_IDS:
+        query_rows = query_rows.filter(SourceRecord.id.notin_(exclude_ids))
+
+    record_ids_by_row: list[int] = []
+    vectors = []
+    # Stream rows; only the decoded vectors are kept, not the base64 text
+    for rid, embedding in query_rows.yield_per(500):
+        if rid in exclude_ids:
             continue
         try:
-            vec = json.loads(emb.embedding)
-        except (json.JSONDecodeError, TypeError):
+            vectors.append(unpack_embedding(embedding))
+        except (ValueError, TypeError):
             continue
-        sim = _cosine_similarity(query_vec, vec)
-        if sim >= threshold:
-            scored.append((sim, emb.source_record_id))
-
-    # Dedupe by source_record_id, keep highest score
-    best: dict[int, float] = {}
-    for sim, rid in scored:
-        if rid not in best or sim > best[rid]:
-            best[rid] = sim
-    ranked = sorted(best.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        record_ids_by_row.append(rid)
+
+    # Score every chunk in one batch. Stored vectors are unit length: new
+    # rows are normalized on write and OpenAI returns unit-norm embeddings,
+    # which covers rows written before that.
+    sims = _cosine_similarities(query_vec, vectors, unit_vectors=True)
+    hits = sorted(
+        ((rid, sim) for rid, sim in zip(record_ids_by_row, sims) if sim >= threshold),
+        key=itemgetter(1),
+    )
+    # Dedupe by source_record_id: hits ascend by score, so each record's
+    # highest-scoring chunk is the one dict() keeps
+    best = dict(hits)
+    ranked = heapq.nlargest(top_k, best.items(), key=itemgetter(1))
 
     record_ids = [rid for rid, _ in ranked]
     if not record_ids:
         return []
 
-    records = session.query(SourceRecord).filter(SourceRecord.id.in_(record_ids)).all()
+    records = (
+        session.query(SourceRecord)
+        .options(load_only(*_EVIDENCE_COLUMNS))
+        .filter(SourceRecord.id.in_(record_ids))
+        .all()
+    )
     logger.info("Semantic search found %d additional records", len(records))
     return records
 
 
+def _semantic_query(person_name: str | None, company_name: str | None) -> str:
+    """The text embedded for an entity's semantic search."""
+    return " ".join(p for p in [person_name, company_name] if p)
+
+
+def _embed_queries(queries: list[str]) -> list[list[float] | None]:
+    """Embed distinct non-empty *queries* in one request.
+
+    Returns one vector per query, or None where the query is empty or the
+    batch failed; ``_semantic_search`` then embeds that query on its own.
+    """
+    unique = list(dict.fromkeys(q for q in queries if q.strip()))
+    if not settings.openai_api_key or not unique:
+        return [None] * len(queries)
+    try:
+        from app.clients.openai_client import EmbeddingClient
+        vectors = EmbeddingClient().embed(unique)
+    except Exception:
+        logger.debug("Batch query embedding failed – falling back to per-entity calls")
+        return [None] * len(queries)
+    if len(vectors) != len(unique):
+        logger.warning(
+            "Batch query embedding returned %d vectors for %d queries – ignoring",
+            len(vectors), len(unique),
+        )
+        return [None] * len(queries)
+    by_query = dict(zip(unique, vectors))
+    return [by_query.get(q) for q in queries]
+
+
+def retrieve_for_entities(targets: list[dict]) -> list[RetrievedEvidence]:
+    """Retrieve evidence for several entities, sharing one embedding request.
+
+    Each item of *targets* holds the keyword arguments for
+    ``retrieve_for_entity``. All semantic-search queries are embedded in a
+    single batch before the per-entity retrieval runs, and every entity is
+    retrieved on one shared session.
+    """
+    queries = [_semantic_query(t.get("person_name"), t.get("company_name")) for t in targets]
+    vectors = _embed_queries(queries)
+    init_db()
+    session = get_session()
+    try:
+        return [
+            _retrieve_in_session(session, **target, query_embedding=vec)
+            for target, vec in zip(targets, vectors)
+        ]
+    finally:
+        session.close()
+
+
 def retrieve_for_entity(
     entity_id: int | None = None,
     person_name: str | None = None,
@@ -118,6 +291,7 @@ def retrieve_for_entity(
     aliases: list[str] | None = None,
     domains: list[str] | None = None,
     window_days: int | None = None,
+    query_embedding: Sequence[float] | None = None,
 ) -> RetrievedEvidence:
     """Retrieve all relevant evidence for an entity.
 
@@ -125,141 +299,179 @@ def retrieve_for_entity(
     1. entity_id direct match
     2. Participant name/email matching in source_records
     3. Body text search for company domains
+
+    *query_embedding* is a precomputed vector for the semantic-search query.
     """
     init_db()
     session = get_session()
+    try:
+        return _retrieve_in_session(
+            session,
+            entity_id=entity_id,
+            person_name=person_name,
+            company_name=company_name,
+            emails=emails,
+            aliases=aliases,
+            domains=domains,
+            window_days=window_days,
+            query_embedding=query_embedding,
+        )
+    finally:
+        session.close()
+
+
+def _retrieve_in_session(
+    session,
+    entity_id: int | None = None,
+    person_name: str | None = None,
+    company_name: str | None = None,
+    emails: list[str] | None = None,
+    aliases: list[str] | None = None,
+    domains: list[str] | None = None,
+    window_days: int | None = None,
+    query_embedding: Sequence[float] | None = None,
+) -> RetrievedEvidence:
+    """Run the retrieval strategies on an already open *session*."""
     evidence = RetrievedEvidence()
     window = window_days or settings.retrieval_window_days
     since = datetime.utcnow() - timedelta(days=window)
 
-    try:
-        # Build candidate records
-        candidates: list[SourceRecord] = []
-
-        # Strategy 1: Direct entity_id match
-        if entity_id:
-            records = (
-                session.query(SourceRecord)
-                .filter(SourceRecord.entity_id == entity_id)
-                .filter(SourceRecord.date >= since)
-                .order_by(desc(SourceRecord.date))
-                .all()
-            )
-            candidates.extend(records)
-
-        # Strategy 2: Participant matching
-        search_terms = set()
-        if person_name:
-            search_terms.add(person_name.lower())
-        if emails:
-            search_terms.update(e.lower() for e in emails)
-        if aliases:
-            search_terms.update(a.lower() for a in aliases)
-        if domains:
-            search_terms.update(d.lower() for d in domains)
-        if company_name:
-            search_terms.add(company_name.lower())
-
-        if search_terms:
-            all_records = (
-                session.query(SourceRecord)
-                .filter(SourceRecord.date >= since)
-                .order_by(desc(SourceRecord.date))
-                .all()
-            )
-            seen_ids = {r.id for r in candidates}
-            for record in all_records:
-                if record.id in seen_ids:
-                    continue
-                # Check participants
-                participants = json.loads(record.participants) if record.participants else []
-                participant_text = " ".join(str(p).lower() for p in participants)
-                body_text = (record.body or "").lower()
-                title_text = (record.title or "").lower()
-                searchable = f"{participant_text} {title_text}"
-
-                for term in search_terms:
-                    if term in searchable or term in body_text:
-                        candidates.append(record)
-                        seen_ids.add(record.id)
-                        break
-
-        # Strategy 3: Semantic search (boost with embeddings)
-        query_parts = [p for p in [person_name, company_name] if p]
-        if query_parts:
-            seen_ids = {r.id for r in candidates}
-            sem_records = _semantic_search(
-                session,
-                query=" ".join(query_parts),
-                since=since,
-                exclude_ids=seen_ids,
-            )
-            candidates.extend(sem_records)
-
-        # Sort by date descending
-        candidates.sort(key=lambda r: r.date or datetime.min, reverse=True)
-        evidence.all_source_records = candidates
-
-        # Build interactions list
-        for record in candidates:
-            action_items_raw = json.loads(record.action_items) if record.action_items else []
-
-            interaction = {
+    # Start the query-embedding HTTP call now so it overlaps with the
+    # Strategy 1/2 database queries instead of running after them
+    semantic_query = _semantic_query(person_name, company_name)
+    embedding_future: Future[Sequence[float]] | None = None
+    if semantic_query and query_embedding is None and settings.openai_api_key:
+        embedding_future = _EMBED_POOL.submit(_embed_query, semantic_query)
+
+    # Build candidate records
+    candidates: list[SourceRecord] = []
+
+    # Strategy 1: Direct entity_id match
+    if entity_id:
+        records = (
+            session.query(SourceRecord)
+            .options(load_only(*_EVIDENCE_COLUMNS))
+            .filter(SourceRecord.entity_id == entity_id)
+            .filter(SourceRecord.date >= since)
+            .order_by(desc(SourceRecord.date))
+            .all()
+        )
+        candidates.extend(records)
+
+    # Strategy 2: Participant matching
+    search_terms = set()
+    if person_name:
+        search_terms.add(person_name.lower())
+    if emails:
+        search_terms.update(e.lower() for e in emails)
+    if aliases:
+        search_terms.update(a.lower() for a in aliases)
+    if domains:
+        search_terms.update(d.lower() for d in domains)
+    if company_name:
+        search_terms.add(company_name.lower())
+
+    if search_terms:
+        term_query = (
+            session.query(SourceRecord)
+            .options(load_only(*_EVIDENCE_COLUMNS))
+            .filter(SourceRecord.date >= since)
+            .order_by(desc(SourceRecord.date))
+        )
+        # Let the database discard rows that mention no term at all, so
+        # non-matching bodies are never loaded; the loop below is exact
+        prefilter = contains_any(
+            [SourceRecord.participants, SourceRecord.title, SourceRecord.body],
+            sorted(search_terms),
+        )
+        if prefilter is not None:
+            term_query = term_query.filter(prefilter)
+        seen_ids = {r.id for r in candidates}
+        # Stream in batches: only matching records are kept
+        for record in term_query.yield_per(500):
+            if record.id in seen_ids:
+                continue
+            # Check participants
+            participants = json.loads(record.participants) if record.participants else []
+            participant_text = " ".join(str(p).lower() for p in participants)
+            body_text = (record.body or "").lower()
+            title_text = (record.title or "").lower()
+            searchable = f"{participant_text} {title_text}"
+
+            for term in search_terms:
+                if term in searchable or term in body_text:
+                    candidates.append(record)
+                    seen_ids.add(record.id)
+                    break
+
+    # Strategy 3: Semantic search (boost with embeddings)
+    if semantic_query:
+        if embedding_future is not None:
+            query_embedding = embedding_future.result()
+        seen_ids = {r.id for r in candidates}
+        sem_records = _semantic_search(
+            session,
+            query=semantic_query,
+            since=since,
+            exclude_ids=seen_ids,
+            query_vec=query_embedding,
+        )
+        candidates.extend(sem_records)
+
+    # Sort by date descending
+    candidates.sort(key=lambda r: r.date or datetime.min, reverse=True)
+    evidence.all_source_records = candidates
+
+    # Build interactions list
+    for record in candidates:
+        action_items_raw = json.loads(record.action_items) if record.action_items else []
+
+        interaction = {
+            "source_type": record.source_type,
+            "source_id": record.source_id,
+            "title": record.title,
+            "date": record.date.isoformat() if record.date else None,
+            "summary": record.summary,
+            "participants": json.loads(record.participants) if record.participants else [],
+            "action_items": action_items_raw,
+            "body_preview": (record.body or "")[:1000],
+            "db_id": record.id,
+        }
+        evidence.interactions.append(interaction)
+
+        # Collect action items
+        for item in action_items_raw:
+            evidence.action_items.append({
+                "description": item,
                 "source_type": record.source_type,
                 "source_id": record.source_id,
-                "title": record.title,
                 "date": record.date.isoformat() if record.date else None,
-                "summary": record.summary,
-                "participants": json.loads(record.participants) if record.participants else [],
-                "action_items": action_items_raw,
-                "body_preview": (record.body or "")[:1000],
-                "db_id": record.id,
-            }
-            evidence.interactions.append(interaction)
-
-            # Collect action items
-            for item in action_items_raw:
-                evidence.action_items.append({
-                    "description": item,
-                    "source_type": record.source_type,
-                    "source_id": record.source_id,
-                    "date": record.date.isoformat() if record.date else None,
-                })
-
-            # Extract concern/objection snippets from body
-            body = record.body or ""
-            concern_keywords = [
-                "concern", "worried", "risk", "issue", "problem",
-                "objection", "pushback", "blocker", "hesitant",
-                "not sure", "disagree", "budget", "timeline",
-            ]
-            body_lower = body.lower()
-            for keyword in concern_keywords:
-                idx = body_lower.find(keyword)
-                if idx >= 0:
-                    # Extract surrounding context (~200 chars)
-                    start = max(0, idx - 100)
-                    end = min(len(body), idx + 100)
-                    snippet = body[start:end].strip()
-                    evidence.concern_snippets.append({
-                        "keyword": keyword,
-                        "snippet": snippet,
-                        "source_type": record.source_type,
-                        "source_id": record.source_id,
-                        "date": record.date.isoformat() if record.date else None,
-                    })
-
-        # Set last interaction
-        if evidence.interactions:
-            evidence.last_interaction = evidence.interactions[0]
-
-        logger.info(
-            "Retrieved %d interactions, %d action items, %d concern snippets",
-            len(evidence.interactions),
-            len(evidence.action_items),
-            len(evidence.concern_snippets),
-        )
+            })
+
+        # Extract concern/objection snippets from body
+        body = record.body or ""
+        for keyword, idx in _first_concern_hits(body):
+            # Extract surrounding context (~200 chars)
+            start = max(0, idx - 100)
+            end = min(len(body), idx + 100)
+            snippet = body[start:end].strip()
+            evidence.concern_snippets.append({
+                "keyword": keyword,
+                "snippet": snippet,
+                "source_type": record.source_type,
+                "source_id": record.source_id,
+                "date": record.date.isoformat() if record.date else None,
+            })
 
-        return evidence
-    finally:
-        session.close()
+    # Set last interaction
+    if evidence.interactions:
+        evidence.last_interaction = evidence.interactions[0]
+
+    logger.info(
+        "Retrieved %d interactions, %d action items, %d concern snippets",
+        len(evidence.interactions),
+        len(evidence.action_items),
+        len(evidence.concern_snippets),
+    )
+
+    return evidence
@@ -14,6 +14,8 @@ import logging
 import re
 from datetime import datetime, timedelta
 
+from sqlalchemy import func, insert
+
 from app.config import settings
 from app.store.database import (
     ActionItemRecord,
@@ -30,36 +32,61 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _CRITICAL_PATTERNS = [
-    re.compile(r"\b(urgent|asap|immediately|critical|emergency|blocking|blocker)\b", re.I),
-    re.compile(r"\b(today|by\s+eod|end\s+of\s+day|right\s+away)\b", re.I),
+    re.compile(r"\b(urgent|asap|immediately|critical|emergency|blocking|blocker)\b", re.IGNORECASE),
+    re.compile(r"\b(today|by\s+eod|end\s+of\s+day|right\s+away)\b", re.IGNORECASE),
 ]
 
 _HIGH_PATTERNS = [
-    re.compile(r"\b(important|priority|deadline|must|required|essential)\b", re.I),
-    re.compile(r"\b(this\s+week|by\s+friday|by\s+monday|tomorrow)\b", re.I),
-    re.compile(r"\b(follow.?up\s+immediately|time.?sensitive)\b", re.I),
+    re.compile(r"\b(important|priority|deadline|must|required|essential)\b", re.IGNORECASE),
+    re.compile(r"\b(this\s+week|by\s+friday|by\s+monday|tomorrow)\b", re.IGNORECASE),
+    re.compile(r"\b(follow.?up\s+immediately|time.?sensitive)\b", re.IGNORECASE),
 ]
 
 _LOW_PATTERNS = [
-    re.compile(r"\b(when\s+you\s+get\s+a\s+chance|no\s+rush|low\s+priority)\b", re.I),
-    re.compile(r"\b(eventually|someday|nice\s+to\s+have|optional|fyi)\b", re.I),
-    re.compile(r"\b(whenever|backlog|parking\s+lot)\b", re.I),
+    re.compile(r"\b(when\s+you\s+get\s+a\s+chance|no\s+rush|low\s+priority)\b", re.IGNORECASE),
+    re.compile(r"\b(eventually|someday|nice\s+to\s+have|optional|fyi)\b", re.IGNORECASE),
+    re.compile(r"\b(whenever|backlog|parking\s+lot)\b", re.IGNORECASE),
 ]
 
 
+_PRIORITY_TIERS = [
+    ("critical", _CRITICAL_PATTERNS),
+    ("high", _HIGH_PATTERNS),
+    ("low", _LOW_PATTERNS),
+]
+
+# All tiers in one zero-width lookahead, tried at every offset in tier order.
+# Matches never consume text, so a longer lower-tier phrase ("follow up
+# immediately") can't hide a higher-tier word inside it ("immediately").
+_PRIORITY_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{tier}>" + "|".join(p.pattern for p in patterns) + ")"
+        for tier, patterns in _PRIORITY_TIERS
+    ) + ")",
+    re.IGNORECASE,
+)
+
+
 def infer_priority(text: str) -> str:
     """Infer action item priority from text signals.
 
+    One scan of ``_PRIORITY_RE`` finds the highest tier present, stopping
+    at the first critical signal.
+
     Returns: 'critical', 'high', 'medium', or 'low'.
     """
     if not text:
         return "medium"
 
-    if any(p.search(text) for p in _CRITICAL_PATTERNS):
-        return "critical"
-    if any(p.search(text) for p in _HIGH_PATTERNS):
+    found = set()
+    for match in _PRIORITY_RE.finditer(text):
+        tier = match.lastgroup
+        if tier == "critical":
+            return "critical"
+        found.add(tier)
+    if "high" in found:
         return "high"
-    if any(p.search(text) for p in _LOW_PATTERNS):
+    if "low" in found:
         return "low"
     return "medium"
 
@@ -70,18 +97,21 @@ def infer_priority(text: str) -> str:
 
 _ACTION_ITEM_PATTERNS = [
     # Explicit markers
-    re.compile(r"(?:action\s+item|todo|to.do|task)[:\s]+(.+?)(?:\n|$)", re.I),
+    re.compile(r"(?:action\s+item|todo|to.do|task)[:\s]+(.+?)(?:\n|$)", re.IGNORECASE),
     # "Please [verb]..." patterns
-    re.compile(r"(?:please|pls|kindly)\s+(send|review|prepare|schedule|follow|update|share|confirm|check|create|set\s+up|draft|submit|complete|finalize)[\s:]+(.+?)(?:\.|;|\n|$)", re.I),
+    re.compile(r"(?:please|pls|kindly)\s+(send|review|prepare|schedule|follow|update|share|confirm|check|create|set\s+up|draft|submit|complete|finalize)[\s:]+(.+?)(?:\.|;|\n|$)", re.IGNORECASE),
     # "Can you [verb]..." patterns
-    re.compile(r"(?:can|could|would)\s+you\s+(?:please\s+)?(send|review|prepare|schedule|follow|update|share|confirm|check|create|set\s+up|draft|submit)[\s:]+(.+?)(?:\?|\.|;|\n|$)", re.I),
+    re.compile(r"(?:can|could|would)\s+you\s+(?:please\s+)?(send|review|prepare|schedule|follow|update|share|confirm|check|create|set\s+up|draft|submit)[\s:]+(.+?)(?:\?|\.|;|\n|$)", re.IGNORECASE),
     # "I need you to..." patterns
-    re.compile(r"(?:i\s+need|we\s+need)\s+(?:you\s+)?to\s+(.+?)(?:\.|;|\n|$)", re.I),
+    re.compile(r"(?:i\s+need|we\s+need)\s+(?:you\s+)?to\s+(.+?)(?:\.|;|\n|$)", re.IGNORECASE),
     # "Next steps:" section
-    re.compile(r"next\s+steps?[:\s]+(.+?)(?:\n\n|\Z)", re.I | re.S),
+    re.compile(r"next\s+steps?[:\s]+(.+?)(?:\n\n|\Z)", re.IGNORECASE | re.DOTALL),
 ]
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def extract_action_items_from_email(
     body: str,
     subject: str = "",
@@ -96,6 +126,9 @@ def extract_action_items_from_email(
     items = []
     seen_titles = set()
 
+    # Each pattern scans the whole body on its own: the patterns overlap (a
+    # "please ..." line inside a "Next steps:" block, "task" inside a
+    # longer word), and one alternation would let a hit hide those inside it
     for pattern in _ACTION_ITEM_PATTERNS:
         for match in pattern.finditer(body):
             # Get the full match or the most relevant group
@@ -106,7 +139,7 @@ def extract_action_items_from_email(
                 title = groups[0].strip() if groups else match.group(0).strip()
 
             # Clean up
-            title = re.sub(r"\s+", " ", title)
+            title = _WHITESPACE_RE.sub(" ", title)
             title = title.strip("- •·")
 
             # Skip duplicates and too-short items
@@ -174,13 +207,15 @@ def persist_action_items(
     """Persist extracted action items to the database.
 
     Deduplicates by (source_id, title) to avoid re-extracting on re-sync.
-    Returns list of created ActionItemRecords.
+    New rows go out as one multi-row INSERT ... RETURNING rather than a
+    flush per ORM object. Returns list of created ActionItemRecords.
     """
     if not items:
         return []
 
     session = get_session()
-    created = []
+    # Keep the returned rows readable after commit and close
+    session.expire_on_commit = False
     try:
         # Get existing items for this source to dedup
         existing_titles = set()
@@ -190,26 +225,33 @@ def persist_action_items(
             ).all()
             existing_titles = {r.title.lower() for r in existing}
 
+        rows = []
         for item in items:
             title = item["title"]
             if title.lower() in existing_titles:
                 continue
 
-            record = ActionItemRecord(
-                title=title,
-                description=item.get("description"),
-                source_type=source_type,
-                source_id=source_id,
-                source_record_id=source_record_id,
-                entity_id=entity_id,
-                project_id=project_id,
-                priority=item.get("priority", "medium"),
-                status="open",
-            )
-            session.add(record)
-            created.append(record)
+            rows.append({
+                "title": title,
+                "description": item.get("description"),
+                "source_type": source_type,
+                "source_id": source_id,
+                "source_record_id": source_record_id,
+                "entity_id": entity_id,
+                "project_id": project_id,
+                "priority": item.get("priority", "medium"),
+                "status": "open",
+            })
             existing_titles.add(title.lower())
 
+        created = []
+        if rows:
+            created = list(session.scalars(
+                insert(ActionItemRecord).returning(
+                    ActionItemRecord, sort_by_parameter_order=True,
+                ),
+                rows,
+            ))
         session.commit()
         if created:
             logger.info(
@@ -230,38 +272,26 @@ def persist_action_items(
 # ---------------------------------------------------------------------------
 
 def get_action_item_stats() -> dict:
-    """Get action item statistics for the dashboard."""
+    """Get action item statistics for the dashboard.
+
+    One GROUP BY over (status, priority) replaces a COUNT query per figure;
+    the totals and breakdowns are summed from its rows.
+    """
     session = get_session()
     try:
-        total = session.query(ActionItemRecord).count()
-        open_count = session.query(ActionItemRecord).filter(
-            ActionItemRecord.status == "open",
-        ).count()
-        in_progress = session.query(ActionItemRecord).filter(
-            ActionItemRecord.status == "in_progress",
-        ).count()
-        done = session.query(ActionItemRecord).filter(
-            ActionItemRecord.status == "done",
-        ).count()
-
-        # Priority breakdown for open items
-        critical = session.query(ActionItemRecord).filter(
-            ActionItemRecord.status.in_(["open", "in_progress"]),
-            ActionItemRecord.priority == "critical",
-        ).count()
-        high = session.query(ActionItemRecord).filter(
-            ActionItemRecord.status.in_(["open", "in_progress"]),
-            ActionItemRecord.priority == "high",
-        ).count()
-
-        return {
-            "total": total,
-            "open": open_count,
-            "in_progress": in_progress,
-            "done": done,
-            "critical": critical,
-            "high": high,
-        }
+        rows = session.query(
+            ActionItemRecord.status, ActionItemRecord.priority, func.count(),
+        ).group_by(ActionItemRecord.status, ActionItemRecord.priority).all()
+
+        stats = {"total": 0, "open": 0, "in_progress": 0, "done": 0, "critical": 0, "high": 0}
+        for status, priority, count in rows:
+            stats["total"] += count
+            if status in ("open", "in_progress", "done"):
+                stats[status] += count
+            # Priority breakdown for open items
+            if status in ("open", "in_progress") and priority in ("critical", "high"):
+                stats[priority] += count
+        return stats
     except Exception:
         logger.exception("Failed to get action item stats")
         return {"total": 0, "open": 0, "in_progress": 0, "done": 0, "critical": 0, "high": 0}
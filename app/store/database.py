@@ -19,6 +19,7 @@ from sqlalchemy import (
     String,
     Text,
     create_engine,
+    or_,
     text,
 )
 from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
@@ -123,12 +124,16 @@ class EmbeddingRecord(Base):
     source_record_id = Column(Integer, ForeignKey("source_records.id"), nullable=False)
     chunk_index = Column(Integer, default=0)
     chunk_text = Column(Text, nullable=False)
-    embedding = Column(Text, nullable=False)  # JSON list[float]; for Supabase use pgvector
+    embedding = Column(Text, nullable=False)  # base64 float32, or JSON list (pgvector/legacy)
     model = Column(String(128), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     source_record = relationship("SourceRecord", backref="embeddings")
 
+    __table_args__ = (
+        Index("ix_embeddings_source_record", "source_record_id"),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Projects
@@ -218,6 +223,8 @@ class ActionItemRecord(Base):
         Index("ix_action_items_priority", "priority"),
         Index("ix_action_items_entity", "entity_id"),
         Index("ix_action_items_project", "project_id"),
+        # Covers the (status, priority) GROUP BY behind the dashboard stats
+        Index("ix_action_items_status_priority", "status", "priority"),
     )
 
     def get_metadata(self) -> dict:
@@ -318,20 +325,32 @@ def get_session_factory(url: str | None = None) -> sessionmaker:
     return factory
 
 
+# URLs whose schema has already been created/probed in this process
+_initialized_urls: set[str] = set()
+
+
 def init_db(url: str | None = None) -> None:
     """Create all tables if they don't exist.
 
     On Postgres, probes for the pgvector extension but never attempts to
     CREATE it (which requires superuser on managed hosts like Railway).
-    The embeddings table always uses a TEXT column with JSON-serialised
-    vectors so the application works identically with or without pgvector.
+    The embeddings model always declares a TEXT column with text-encoded
+    vectors so the application works identically with or without pgvector;
+    when the extension is detected, vectors are written in the JSON form
+    that a ``vector`` column (migration 003) also accepts (see
+    ``app.normalize.embeddings.pack_embedding``).
+
+    Runs once per database URL per process; later calls return immediately,
+    so per-record code paths can call it without re-checking the schema.
     """
     global _pgvector_available
     import logging
     _log = logging.getLogger(__name__)
 
-    engine = get_engine(url)
     effective_url = url or settings.effective_database_url
+    if effective_url in _initialized_urls:
+        return
+    engine = get_engine(url)
     if not effective_url.startswith("sqlite"):
         try:
             with engine.connect() as conn:
@@ -351,8 +370,47 @@ def init_db(url: str | None = None) -> None:
         except Exception as exc:
             _log.warning("Could not probe for pgvector extension: %s", exc)
     Base.metadata.create_all(engine)
+    _initialized_urls.add(effective_url)
 
 
 def get_session(url: str | None = None) -> Session:
     factory = get_session_factory(url)
     return factory()
+
+
+def upsert_source_record(session: Session, values: dict, update: dict) -> SourceRecord:
+    """Insert a SourceRecord, or apply *update* to the row with the same source_id.
+
+    Issues a single ``INSERT ... ON CONFLICT (source_id) DO UPDATE ... RETURNING``
+    (SQLite 3.35+ and Postgres) and returns the ORM instance for the row,
+    refreshed from the database even if it was already loaded in *session*.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = (
+        dialect_insert(SourceRecord)
+        .values(**values)
+        .on_conflict_do_update(index_elements=["source_id"], set_=update)
+        .returning(SourceRecord)
+        .execution_options(populate_existing=True)
+    )
+    return session.scalars(stmt).one()
+
+
+def contains_any(columns: list, needles: list[str]):
+    """SQL prefilter: rows whose JSON/text *columns* may contain any of *needles*.
+
+    SQLite's LIKE is case-insensitive for ASCII only. Ingest now writes the
+    JSON columns with orjson (``app.utils.jsonio``), which keeps non-ASCII
+    as-is but still escapes quotes and backslashes, and rows written
+    earlier with ``json.dumps`` hold non-ASCII as ``\\uXXXX`` escapes. So
+    needles that are non-ASCII or contain a quote or backslash get no
+    prefilter (returns None) and callers scan every row.
+    Matches are candidates only; callers still run their exact Python check.
+    """
+    if not all(n.isascii() and '"' not in n and "\\" not in n for n in needles):
+        return None
+    return or_(*(col.ilike(f"%{n}%") for col in columns for n in needles))
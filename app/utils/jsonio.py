@@ -0,0 +1,26 @@
+"""Fast JSON helpers backed by orjson.
+
+Drop-in replacements for ``json.dumps``/``json.loads`` on the ingest paths,
+which serialize raw API payloads, participant lists and profile blobs into
+Text columns.  ``dumps`` returns ``str`` so callers can assign the result to a
+column unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+# Like json.dumps, coerce non-string dict keys (ints, enums) to strings
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> str:
+    """Serialize *obj* to a compact JSON string."""
+    return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from ``str`` or ``bytes``."""
+    return orjson.loads(data)
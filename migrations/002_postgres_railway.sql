@@ -3,7 +3,9 @@
 -- Run this against your Railway Postgres database
 --
 -- NOTE: This migration works with OR without pgvector.
--- The embeddings.embedding column is TEXT (JSON-serialised float arrays).
+-- The embeddings.embedding column is TEXT. Without pgvector the app writes
+-- base64-encoded float32 vectors; older rows hold JSON-serialised float
+-- arrays, and both forms are read back.
 -- If you have pgvector installed and want native vector indexing, run
 -- migration 003_enable_pgvector.sql after this one.
 
@@ -10,6 +10,9 @@
 -- (JSON-serialised floats) to native vector(1536) and adds an IVFFlat
 -- index for fast cosine-similarity search.
 --
+-- When the app detects the pgvector extension it writes embeddings in the
+-- JSON '[...]' text form, which this vector column accepts.
+--
 -- WARNING: If the embeddings table already contains data, the ALTER COLUMN
 -- cast will fail because TEXT→vector has no implicit cast.  You must
 -- re-populate embeddings after running this migration (the app will
@@ -0,0 +1,11 @@
+-- Migration 009: Indexes for retrieval and dashboard queries
+-- Supports both SQLite and PostgreSQL
+--
+-- create_all only adds indexes when it creates a table, so databases
+-- created before these indexes were declared on the models need them here.
+
+-- Embeddings are joined to source_records on every semantic search
+CREATE INDEX IF NOT EXISTS ix_embeddings_source_record ON embeddings (source_record_id);
+
+-- Covers the (status, priority) GROUP BY behind the action item dashboard stats
+CREATE INDEX IF NOT EXISTS ix_action_items_status_priority ON action_items (status, priority);
@@ -0,0 +1,113 @@
+"""Tests for action item extraction, persistence and stats."""
+
+from __future__ import annotations
+
+from app.services.action_items import (
+    extract_action_items_from_email,
+    get_action_item_stats,
+    infer_priority,
+    persist_action_items,
+)
+from app.store.database import ActionItemRecord
+
+
+class TestInferPriority:
+    """Test urgency-based priority inference."""
+
+    def test_tiers(self):
+        assert infer_priority("Need this ASAP") == "critical"
+        assert infer_priority("Deadline is Friday") == "high"
+        assert infer_priority("No rush on this one") == "low"
+        assert infer_priority("Send the deck") == "medium"
+        assert infer_priority("") == "medium"
+
+    def test_highest_tier_wins(self):
+        assert infer_priority("fyi, this is important") == "high"
+        assert infer_priority("low priority but blocking the launch") == "critical"
+
+    def test_lower_tier_phrase_does_not_hide_higher_tier_word(self):
+        assert infer_priority("please follow-up immediately") == "critical"
+
+
+class TestEmailExtraction:
+    """Test pattern-based action item extraction from email bodies."""
+
+    def test_each_pattern_kind(self):
+        body = (
+            "Hi,\nAction item: finalize the budget by Friday\n"
+            "Could you please send the signed contract?\n"
+            "We need you to review the draft carefully.\n\n"
+            "Next steps: book the venue and\nconfirm catering\n\nThanks"
+        )
+        titles = [i["title"] for i in extract_action_items_from_email(body)]
+        assert "finalize the budget by Friday" in titles
+        assert "send the signed contract" in titles
+        assert "review the draft carefully" in titles
+        assert "book the venue and confirm catering" in titles
+
+    def test_requests_inside_next_steps_block_are_kept(self):
+        body = (
+            "Next steps:\n- please send the pricing sheet to legal\n"
+            "- Can you review the MSA redlines?\n\nThanks"
+        )
+        titles = [i["title"] for i in extract_action_items_from_email(body)]
+        assert "send the pricing sheet to legal" in titles
+        assert "review the MSA redlines" in titles
+
+    def test_marker_inside_longer_word_does_not_hide_request(self):
+        body = "I tend to multitask plan: please review the draft agreement before Monday."
+        titles = [i["title"] for i in extract_action_items_from_email(body)]
+        assert "review the draft agreement before Monday" in titles
+
+    def test_no_matches(self):
+        assert extract_action_items_from_email("Thanks for the great chat yesterday!") == []
+
+
+class TestPersistActionItems:
+    """Test writing extracted action items."""
+
+    def test_inserts_new_items_and_skips_known_titles(self, db_session):
+        items = [
+            {"title": "Send the proposal", "priority": "high"},
+            {"title": "send the proposal"},
+            {"title": "Book the venue"},
+        ]
+        created = persist_action_items(items, "gmail", "msg-1", entity_id=None)
+
+        assert [(r.title, r.priority, r.status) for r in created] == [
+            ("Send the proposal", "high", "open"),
+            ("Book the venue", "medium", "open"),
+        ]
+        assert all(r.id and r.extracted_at for r in created)
+
+        again = persist_action_items(
+            [{"title": "BOOK THE VENUE"}, {"title": "Share the deck"}], "gmail", "msg-1",
+        )
+        assert [r.title for r in again] == ["Share the deck"]
+        assert db_session.query(ActionItemRecord).count() == 3
+
+
+class TestActionItemStats:
+    """Test the dashboard action item counters."""
+
+    def test_empty(self):
+        assert get_action_item_stats() == {
+            "total": 0, "open": 0, "in_progress": 0, "done": 0, "critical": 0, "high": 0,
+        }
+
+    def test_counts_by_status_and_open_priority(self, db_session):
+        for status, priority in [
+            ("open", "critical"),
+            ("open", "high"),
+            ("open", "medium"),
+            ("in_progress", "critical"),
+            ("done", "critical"),
+            ("done", "high"),
+            ("snoozed", "high"),
+        ]:
+            db_session.add(ActionItemRecord(title="t", status=status, priority=priority))
+        db_session.commit()
+
+        assert get_action_item_stats() == {
+            "total": 7, "open": 3, "in_progress": 1, "done": 2, "critical": 2, "high": 1,
+        }
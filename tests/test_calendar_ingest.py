@@ -12,11 +12,16 @@ os.environ["BRIEFING_API_KEY"] = ""
 
 from unittest.mock import MagicMock, patch
 
+from sqlalchemy import inspect
+
 from app.clients.calendar import CalendarClient, normalize_event_for_storage
 from app.ingest.calendar_ingest import (
     CalendarIngestResult,
     _attach_meeting_to_contact,
+    _AttendeeIndex,
+    _build_email_index,
     _create_contact_stub,
+    _flush_profiles,
     _fuzzy_name_match,
     _match_attendee,
     run_calendar_ingest,
@@ -25,6 +30,7 @@ from app.ingest.gmail_meeting_enrichment import (
     MeetingEnrichmentResult,
     _extract_commitments,
     _summarize_thread,
+    enrich_all_upcoming_meetings,
     enrich_meeting_context,
 )
 from app.store.database import EntityRecord, get_session, init_db
@@ -54,6 +60,17 @@ class TestCalendarEventNormalization:
         assert len(normalized["attendees"]) == 2
         assert normalized["attendees"][0]["email"] == "andy@acme.com"
 
+    def test_normalize_marks_resource_attendees(self):
+        raw = {
+            "id": "evt124",
+            "attendees": [
+                {"email": "c_1885@resource.calendar.google.com", "resource": True},
+                {"email": "andy@acme.com"},
+            ],
+        }
+        normalized = CalendarClient()._normalize_event(raw)
+        assert [a["resource"] for a in normalized["attendees"]] == [True, False]
+
     def test_normalize_for_storage(self):
         event = {
             "id": "evt123",
@@ -72,11 +89,18 @@ class TestCalendarEventNormalization:
         assert "andy@acme.com" in stored["attendee_emails"]
 
 
+def _index_of(*entities: EntityRecord) -> _AttendeeIndex:
+    index = _AttendeeIndex()
+    for entity in entities:
+        index.add(entity)
+    return index
+
+
 class TestAttendeeMatching:
     def test_email_exact_match(self):
         entity = EntityRecord(name="Andy Sweet", entity_type="person")
         entity.set_emails(["andy@acme.com"])
-        index = {"andy@acme.com": entity}
+        index = _index_of(entity)
 
         matched, reason = _match_attendee(
             {"email": "andy@acme.com", "name": "Andy Sweet"},
@@ -87,7 +111,7 @@ class TestAttendeeMatching:
         assert reason == "email_match"
 
     def test_no_match_returns_none(self):
-        index = {}
+        index = _index_of()
         matched, reason = _match_attendee(
             {"email": "unknown@other.com", "name": "Unknown"},
             index,
@@ -100,10 +124,7 @@ class TestAttendeeMatching:
         entity = EntityRecord(name="Andy Sweet", entity_type="person")
         entity.set_emails(["andy@acme.com"])
         entity.set_aliases(["andrew@acme.com"])
-        index = {
-            "andy@acme.com": entity,
-            "andrew@acme.com": entity,
-        }
+        index = _index_of(entity)
 
         matched, reason = _match_attendee(
             {"email": "andrew@acme.com", "name": "Andrew Sweet"},
@@ -116,7 +137,7 @@ class TestAttendeeMatching:
         """Same name should match even with different email."""
         entity = EntityRecord(name="Andy Sweet", entity_type="person")
         entity.set_emails(["a.sweet@acme.com"])
-        index = {"a.sweet@acme.com": entity}
+        index = _index_of(entity)
 
         matched, reason = _match_attendee(
             {"email": "andy.sweet@acme.com", "name": "andy sweet"},
@@ -129,7 +150,7 @@ class TestAttendeeMatching:
         """Similar name + same domain should match."""
         entity = EntityRecord(name="Andrew Sweet", entity_type="person")
         entity.set_emails(["a.sweet@acme.com"])
-        index = {"a.sweet@acme.com": entity}
+        index = _index_of(entity)
 
         matched, reason = _match_attendee(
             {"email": "andy.sweet@acme.com", "name": "andy sweet"},
@@ -138,8 +159,33 @@ class TestAttendeeMatching:
         assert matched is not None
         assert reason == "name_domain_match"
 
+    def test_name_domain_match_ignores_other_domains(self):
+        """Fuzzy name matching only considers contacts on the attendee's domain."""
+        entity = EntityRecord(name="Andrew Sweet", entity_type="person")
+        entity.set_emails(["a.sweet@other.com"])
+
+        matched, reason = _match_attendee(
+            {"email": "andy.sweet@acme.com", "name": "andy sweet"},
+            _index_of(entity),
+        )
+        assert matched is None
+        assert reason == "no_match"
+
+    def test_name_domain_match_prefers_closest_spelling(self):
+        smyth = EntityRecord(name="John Smyth", entity_type="person")
+        smyth.set_emails(["j.smyth@acme.com"])
+        smiths = EntityRecord(name="John Smiths", entity_type="person")
+        smiths.set_emails(["j.smiths@acme.com"])
+
+        matched, reason = _match_attendee(
+            {"email": "jsmith@acme.com", "name": "john smith"},
+            _index_of(smyth, smiths),
+        )
+        assert matched is smiths
+        assert reason == "name_domain_match"
+
     def test_no_email_returns_no_email(self):
-        matched, reason = _match_attendee({"email": "", "name": "Test"}, {})
+        matched, reason = _match_attendee({"email": "", "name": "Test"}, _index_of())
         assert matched is None
         assert reason == "no_email"
 
@@ -154,39 +200,36 @@ class TestFuzzyNameMatch:
     def test_different_names(self):
         assert not _fuzzy_name_match("john doe", "jane smith")
 
+    def test_near_identical_spelling(self):
+        assert _fuzzy_name_match("john smith", "john smyth")
+
+    def test_spelling_just_below_cutoff(self):
+        assert not _fuzzy_name_match("john smith", "john smythe")
+
+    def test_first_name_only_does_not_match(self):
+        assert not _fuzzy_name_match("andy", "andy sweet")
+
     def test_empty_names(self):
         assert not _fuzzy_name_match("", "")
 
 
 class TestContactStubCreation:
     def test_creates_stub_with_email(self):
-        session = get_session("sqlite:///./test_briefing_engine.db")
-        try:
-            stub = _create_contact_stub(
-                {"email": "new@acme.com", "name": "New Person"},
-                session,
-            )
-            assert stub.name == "New Person"
-            assert "new@acme.com" in stub.get_emails()
-            profile = json.loads(stub.domains)
-            assert profile["source"] == "calendar_ingest"
-            assert profile["research_status"] == "QUEUED"
-        finally:
-            session.rollback()
-            session.close()
+        stub = _create_contact_stub({"email": "new@acme.com", "name": "New Person"})
+        assert stub.name == "New Person"
+        assert "new@acme.com" in stub.get_emails()
+        profile = json.loads(stub.domains)
+        assert profile["source"] == "calendar_ingest"
+        assert profile["research_status"] == "QUEUED"
 
     def test_creates_stub_without_name(self):
         """When no display name, derives from email."""
-        session = get_session("sqlite:///./test_briefing_engine.db")
-        try:
-            stub = _create_contact_stub(
-                {"email": "john.doe@acme.com", "name": ""},
-                session,
-            )
-            assert stub.name == "John Doe"
-        finally:
-            session.rollback()
-            session.close()
+        stub = _create_contact_stub({"email": "john.doe@acme.com", "name": ""})
+        assert stub.name == "John Doe"
+
+    def test_stub_is_not_persisted(self):
+        stub = _create_contact_stub({"email": "new@acme.com", "name": "New Person"})
+        assert stub.id is None
 
 
 class TestMeetingAttachment:
@@ -231,6 +274,20 @@ class TestMeetingAttachment:
         profile = json.loads(entity.domains)
         assert len(profile["upcoming_meetings"]) == 2
 
+    def test_profile_cache_defers_serialization(self):
+        entity = EntityRecord(name="Test", entity_type="person")
+        entity.domains = json.dumps({"source": "manual"})
+        cache = {}
+
+        _attach_meeting_to_contact(entity, {"calendar_event_id": "e1"}, "email_match", cache)
+        _attach_meeting_to_contact(entity, {"calendar_event_id": "e2"}, "email_match", cache)
+        assert json.loads(entity.domains) == {"source": "manual"}
+
+        _flush_profiles(cache)
+        profile = json.loads(entity.domains)
+        assert profile["source"] == "manual"
+        assert [m["calendar_event_id"] for m in profile["upcoming_meetings"]] == ["e1", "e2"]
+
 
 class TestCalendarIngestResult:
     def test_to_dict(self):
@@ -256,6 +313,88 @@ class TestCalendarIngestNoCredentials:
             assert result.events_fetched == 0
 
 
+def _calendar_event(event_id: str, attendees: list[dict]) -> dict:
+    return {
+        "id": event_id,
+        "title": f"Meeting {event_id}",
+        "start_time": "2026-02-16T10:00:00Z",
+        "end_time": "2026-02-16T11:00:00Z",
+        "attendees": attendees,
+        "organizer_email": "me@mycompany.com",
+    }
+
+
+class TestBuildEmailIndex:
+    def test_indexes_people_without_loading_enrichment_blob(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        try:
+            person = EntityRecord(name="Andrew Sweet", entity_type="person")
+            person.set_emails(["a.sweet@acme.com"])
+            person.enrichment_json = json.dumps({"large": "x" * 1000})
+            company = EntityRecord(name="Acme", entity_type="company")
+            company.set_emails(["info@acme.com"])
+            session.add_all([person, company])
+            session.commit()
+            session.expunge_all()
+
+            index = _build_email_index(session)
+            entity = index.by_email["a.sweet@acme.com"]
+            assert "info@acme.com" not in index.by_email
+            assert "enrichment_json" in inspect(entity).unloaded
+        finally:
+            session.close()
+
+
+class TestCalendarIngestRun:
+    def test_matches_known_contacts_and_creates_stubs_once(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        known = EntityRecord(name="Andrew Sweet", entity_type="person")
+        known.set_emails(["a.sweet@acme.com"])
+        known.domains = json.dumps({})
+        session.add(known)
+        session.commit()
+        session.close()
+
+        events = [
+            _calendar_event("evt1", [
+                {"email": "me@mycompany.com", "name": "Me", "self": True},
+                {"email": "c_1885@resource.calendar.google.com", "name": "Room 4",
+                 "resource": True},
+                {"email": "andy.sweet@acme.com", "name": "andy sweet"},
+                {"email": "new.person@other.com", "name": "New Person"},
+            ]),
+            _calendar_event("evt2", [
+                {"email": "new.person@other.com", "name": "New Person"},
+            ]),
+        ]
+        mock_client = MagicMock()
+        mock_client.fetch_upcoming_events.return_value = events
+        with patch("app.ingest.calendar_ingest.CalendarClient", return_value=mock_client):
+            result = run_calendar_ingest()
+
+        assert result.errors == []
+        assert result.matched_contacts == 2  # Andrew (fuzzy) + stub reuse on evt2
+        assert result.created_stubs == 1
+
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        try:
+            people = {e.name: e for e in session.query(EntityRecord).all()}
+            assert set(people) == {"Andrew Sweet", "New Person"}
+            andrew = json.loads(people["Andrew Sweet"].domains)
+            assert andrew["upcoming_meetings"][0]["match_reason"] == "name_domain_match"
+            stub = json.loads(people["New Person"].domains)
+            assert stub["research_status"] == "QUEUED"
+            assert [m["calendar_event_id"] for m in stub["upcoming_meetings"]] == [
+                "evt1", "evt2",
+            ]
+            stamps = {
+                m["attached_at"] for m in andrew["upcoming_meetings"] + stub["upcoming_meetings"]
+            }
+            assert len(stamps) == 1
+        finally:
+            session.close()
+
+
 # ---------------------------------------------------------------------------
 # Gmail Meeting Enrichment Tests
 # ---------------------------------------------------------------------------
@@ -276,6 +415,12 @@ class TestCommitmentExtraction:
     def test_empty_text(self):
         assert _extract_commitments("") == []
 
+    def test_thread_with_null_snippet(self):
+        result = enrich_meeting_context(
+            "test@example.com", "m1", threads=[{"headers": {}, "body": "", "snippet": None}],
+        )
+        assert result.open_commitments == []
+
     def test_no_commitments(self):
         text = "Thanks for the nice weather today."
         assert _extract_commitments(text) == []
@@ -292,6 +437,17 @@ class TestCommitmentExtraction:
         commitments = _extract_commitments(text)
         assert len(commitments) <= 5
 
+    def test_returns_enclosing_sentences_in_order(self):
+        text = (
+            "Thanks for the call today!\n"
+            "  We AGREED TO the revised scope.  Nice weather though. "
+            "Let me know when the SOW is ready?"
+        )
+        assert _extract_commitments(text) == [
+            "We AGREED TO the revised scope",
+            "Let me know when the SOW is ready",
+        ]
+
 
 class TestThreadSummary:
     def test_basic_summary(self):
@@ -299,6 +455,10 @@ class TestThreadSummary:
         assert "Proposal" in summary
         assert "Thanks" in summary
 
+    def test_flattens_line_breaks(self):
+        summary = _summarize_thread("", "Line one\r\nLine two\n")
+        assert summary == "Line one Line two"
+
     def test_empty_inputs(self):
         summary = _summarize_thread("", "")
         assert "No content" in summary
@@ -354,3 +514,91 @@ class TestEnrichMeetingContext:
         assert result.thread_count == 0
         assert result.confidence_score == 0.1
         assert "No email history" in result.snippet
+
+    def test_commitments_deduplicated_across_threads(self):
+        threads = [
+            {"headers": {}, "body": "I Will Send the deck tomorrow."},
+            {"headers": {}, "body": "i will send the deck tomorrow. Let me know by Friday."},
+        ]
+        result = enrich_meeting_context("test@example.com", "m1", threads=threads)
+        assert result.open_commitments == [
+            "I Will Send the deck tomorrow",
+            "Let me know by Friday",
+        ]
+
+    def test_prefetched_threads_skip_gmail(self):
+        mock_client = MagicMock()
+        result = enrich_meeting_context(
+            "test@example.com", "m1", gmail_client=mock_client,
+            threads=[{"headers": {"date": "2026-02-10"}, "body": "Let me know."}],
+        )
+        mock_client.search_messages.assert_not_called()
+        assert result.thread_count == 1
+        assert result.last_contact_date == "2026-02-10"
+
+
+class TestEnrichAllUpcomingMeetings:
+    def test_searches_gmail_once_per_email(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        contact = EntityRecord(name="Andrew Sweet", entity_type="person")
+        contact.set_emails(["a.sweet@acme.com"])
+        contact.domains = json.dumps({"upcoming_meetings": [
+            {"calendar_event_id": "evt1"},
+            {"calendar_event_id": "evt2"},
+        ]})
+        session.add(contact)
+        session.commit()
+        session.close()
+
+        mock_client = MagicMock()
+        mock_client.search_messages.return_value = [
+            {"headers": {"date": "2026-02-10"}, "body": "I will send the deck."},
+        ]
+        enrichments = enrich_all_upcoming_meetings(gmail_client=mock_client)
+
+        assert mock_client.search_messages.call_count == 1
+        assert [e["meeting_id"] for e in enrichments] == ["evt1", "evt2"]
+        assert all(e["thread_count"] == 1 for e in enrichments)
+
+    def test_skips_contacts_without_meetings_in_sql(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        idle = EntityRecord(name="Idle Contact", entity_type="person")
+        idle.set_emails(["idle@acme.com"])
+        idle.domains = json.dumps({"research_status": "DONE"})
+        busy = EntityRecord(name="Busy Contact", entity_type="person")
+        busy.set_emails(["busy@acme.com"])
+        busy.domains = json.dumps({"upcoming_meetings": [{"calendar_event_id": "evt9"}]})
+        session.add_all([idle, busy])
+        session.commit()
+        session.close()
+
+        mock_client = MagicMock()
+        mock_client.search_messages.return_value = []
+        enrichments = enrich_all_upcoming_meetings(gmail_client=mock_client)
+
+        assert [e["attendee_email"] for e in enrichments] == ["busy@acme.com"]
+        mock_client.search_messages.assert_called_once()
+
+    def test_failed_gmail_init_tried_once_per_run(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        for i in range(2):
+            contact = EntityRecord(name=f"Contact {i}", entity_type="person")
+            contact.set_emails([f"c{i}@acme.com"])
+            contact.domains = json.dumps({"upcoming_meetings": [
+                {"calendar_event_id": f"evt{i}a"},
+                {"calendar_event_id": f"evt{i}b"},
+            ]})
+            session.add(contact)
+        session.commit()
+        session.close()
+
+        with patch(
+            "app.clients.gmail.GmailClient", side_effect=RuntimeError("no credentials"),
+        ) as client_cls:
+            enrichments = enrich_all_upcoming_meetings()
+
+        assert client_cls.call_count == 1
+        assert len(enrichments) == 4
+        assert all(
+            e["error"] == "Gmail client init failed: no credentials" for e in enrichments
+        )
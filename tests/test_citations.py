@@ -19,6 +19,7 @@ from app.brief.generator import (
     _parse_citation,
     _parse_citations,
     _parse_evidence_tag,
+    _parse_severity,
     _parse_tagged_claim,
     _parse_tagged_claims,
     generate_brief,
@@ -79,6 +80,36 @@ class TestCitationParsing:
         citation = _parse_citation(raw)
         assert citation.snippet_hash == _compute_snippet_hash("Some excerpt text")
 
+    def test_parse_citations_share_fallback_timestamp(self):
+        raw = [
+            {"source_type": "gmail", "source_id": "msg-001", "excerpt": "a"},
+            {"source_type": "gmail", "source_id": "msg-002", "excerpt": "b"},
+            {"source_type": "gmail", "source_id": "msg-003", "timestamp": "2026-01-15T10:00:00"},
+        ]
+        citations = _parse_citations(raw)
+        assert citations[0].timestamp == citations[1].timestamp
+        assert citations[2].timestamp == datetime(2026, 1, 15, 10, 0)
+
+    def test_parse_citation_shares_identical_instances(self):
+        raw = {
+            "source_type": "fireflies",
+            "source_id": "ff-001",
+            "timestamp": "2026-01-15T10:00:00",
+            "excerpt": "We discussed the timeline",
+        }
+        first = _parse_citation(raw)
+        assert _parse_citation(dict(raw)) is first
+        assert _parse_citation({**raw, "source_id": "ff-002"}) is not first
+
+    def test_tagged_claim_dedupes_citations(self):
+        raw = [
+            {"source_type": "gmail", "source_id": "msg-001", "timestamp": "2026-01-15T10:00:00"},
+            {"source_type": "gmail", "source_id": "msg-002", "timestamp": "2026-01-15T10:00:00"},
+            {"source_type": "gmail", "source_id": "msg-001", "timestamp": "2026-01-15T10:00:00"},
+        ]
+        claim = TaggedClaim(claim="Owns the budget", citations=_parse_citations(raw))
+        assert [c.source_id for c in claim.citations] == ["msg-001", "msg-002"]
+
     def test_parse_citations_empty(self):
         assert _parse_citations(None) == []
         assert _parse_citations([]) == []
@@ -358,6 +389,17 @@ class TestEvidenceTagParsing:
         assert _parse_evidence_tag("TOTALLY_INVALID") == EvidenceTag.unknown
 
 
+class TestSeverityParsing:
+    """Test watchout severity parsing."""
+
+    def test_parse_severity_normalizes_case(self):
+        assert _parse_severity(" HIGH ") == "high"
+
+    def test_parse_severity_defaults_to_medium(self):
+        assert _parse_severity(None) == "medium"
+        assert _parse_severity("critical") == "medium"
+
+
 class TestTaggedClaimParsing:
     """Test tagged claim parsing from LLM output."""
 
@@ -156,6 +156,28 @@ class TestVisibilitySweepExecution:
         for row in visibility_rows:
             assert row.result_count == 0
 
+    @pytest.mark.asyncio
+    async def test_visibility_sweep_buckets_by_query_category(self):
+        """Each query's hits land in the category declared by its template."""
+
+        async def mock_search(query, num=5):
+            if query.endswith(" podcast"):
+                return _make_serp_results(2)
+            return []
+
+        serp = SerpAPIClient(api_key="test-key")
+
+        with patch.object(serp, "search", side_effect=mock_search):
+            results = await serp.search_visibility_sweep_with_ledger(
+                name="Ted Person",
+                company="",
+                graph=None,
+            )
+
+        assert len(results["podcast"]) == 2
+        assert results["ted"] == []
+        assert sum(len(v) for v in results.values()) == 2
+
     @pytest.mark.asyncio
     async def test_person_search_creates_ledger_rows(self):
         """search_person_with_ledger must create ledger rows for each query category."""
@@ -184,7 +206,7 @@ class TestVisibilitySweepExecution:
         assert len(queries) >= 15
 
         # All must have intent="visibility"
-        for query, intent in queries:
+        for query, intent, _ in queries:
             assert intent == "visibility"
             assert "Test Person" in query
 
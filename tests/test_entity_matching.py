@@ -83,6 +83,32 @@ class TestPersonResolution:
         # Should discover the email from participant list
         assert result.entity_id is not None
 
+    def test_resolve_by_email_ignores_case_and_name(self):
+        result1 = resolve_person("Erin Blake", email="Erin.Blake@corp.com")
+        result2 = resolve_person("E. Blake", email="erin.blake@CORP.com")
+
+        assert result2.entity_id == result1.entity_id
+
+    def test_resolve_discovers_non_ascii_participants(self):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        session.add_all([
+            SourceRecord(
+                source_type="gmail",
+                source_id="test-unicode",
+                participants=json.dumps(["Zoë Ångström <zoe@nordic.se>"]),
+            ),
+            SourceRecord(
+                source_type="gmail",
+                source_id="test-unrelated",
+                participants=json.dumps(["Someone Else <else@other.com>"]),
+            ),
+        ])
+        session.commit()
+        session.close()
+
+        result = resolve_person("Zoë Ångström")
+        assert result.emails == ["zoe@nordic.se"]
+
 
 class TestCompanyResolution:
     """Test company entity resolution."""
@@ -265,6 +265,17 @@ class TestEvidenceGraphLedger:
         assert r2.query_id == "Q2"
         assert r3.query_id == "Q3"
 
+    def test_log_retrieval_batch_preserves_order(self):
+        g = EvidenceGraph()
+        rows = g.log_retrieval_batch([
+            {"query": "q1", "intent": "visibility", "results": [{"title": "T"}]},
+            {"query": "q2", "intent": "bio"},
+        ])
+        assert [r.query_id for r in rows] == ["Q1", "Q2"]
+        assert [r.query for r in g.ledger] == ["q1", "q2"]
+        assert rows[0].result_count == 1
+        assert rows[1].result_count == 0
+
     def test_top_results_capped_at_5(self):
         g = EvidenceGraph()
         results = [{"title": f"Result {i}", "link": f"https://x.com/{i}"} for i in range(10)]
@@ -642,7 +653,7 @@ class TestVisibilityQueryBattery:
         assert len(VISIBILITY_QUERY_TEMPLATES) == 15
 
     def test_all_templates_are_visibility_intent(self):
-        for _, intent in VISIBILITY_QUERY_TEMPLATES:
+        for _, intent, _ in VISIBILITY_QUERY_TEMPLATES:
             assert intent == "visibility"
 
     def test_category_groups_cover_all_templates(self):
@@ -662,7 +673,7 @@ class TestVisibilityQueryBattery:
     def test_build_visibility_queries_basic(self):
         queries = build_visibility_queries("Ben Titmus")
         assert len(queries) >= 15
-        for query, intent in queries:
+        for query, intent, _ in queries:
             assert intent == "visibility"
             assert "Ben Titmus" in query
 
@@ -670,28 +681,28 @@ class TestVisibilityQueryBattery:
         queries = build_visibility_queries("Ben Titmus", "Acme Corp")
         # Should have extra company-qualified query
         assert len(queries) >= 16
-        company_queries = [q for q, _ in queries if "Acme Corp" in q]
+        company_queries = [q for q, _, _ in queries if "Acme Corp" in q]
         assert len(company_queries) >= 1
 
     def test_build_queries_contains_ted_keywords(self):
         queries = build_visibility_queries("Test Person")
-        query_text = " ".join(q for q, _ in queries)
+        query_text = " ".join(q for q, _, _ in queries)
         assert "TED" in query_text
         assert "TEDx" in query_text
 
     def test_build_queries_contains_podcast_keywords(self):
         queries = build_visibility_queries("Test Person")
-        query_text = " ".join(q for q, _ in queries)
+        query_text = " ".join(q for q, _, _ in queries)
         assert "podcast" in query_text.lower()
 
     def test_build_queries_contains_keynote_keywords(self):
         queries = build_visibility_queries("Test Person")
-        query_text = " ".join(q for q, _ in queries)
+        query_text = " ".join(q for q, _, _ in queries)
         assert "keynote" in query_text.lower()
 
     def test_build_queries_contains_youtube_keywords(self):
         queries = build_visibility_queries("Test Person")
-        query_text = " ".join(q for q, _ in queries)
+        query_text = " ".join(q for q, _, _ in queries)
         assert "YouTube" in query_text
 
 
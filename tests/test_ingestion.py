@@ -3,10 +3,21 @@
 from __future__ import annotations
 
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.ingest.fireflies_ingest import normalize_transcript, store_transcript
-from app.ingest.gmail_ingest import normalize_email, store_email
-from app.store.database import SourceRecord, get_session
+import pytest
+from pydantic import ValidationError
+
+from app.ingest.fireflies_ingest import (
+    ingest_fireflies_for_person,
+    normalize_transcript,
+    store_transcript,
+    store_transcripts,
+)
+from app.ingest.gmail_ingest import normalize_email, store_email, store_emails
+from app.store import database
+from app.store.database import EntityRecord, SourceRecord, get_session
+from app.utils import jsonio
 
 
 class TestFirefliesIngestion:
@@ -44,6 +55,23 @@ class TestFirefliesIngestion:
         assert result.sentences[1].speaker == "Jane Doe"
         assert "concern" in result.sentences[1].text.lower()
 
+    def test_transcript_sentences_are_frozen(self, sample_fireflies_transcript):
+        normalized = normalize_transcript(sample_fireflies_transcript)
+        with pytest.raises(ValidationError):
+            normalized.sentences[0].text = "changed"
+
+    def test_normalize_transcript_sentences_ignore_extra_keys(self):
+        raw = {
+            "id": "test-sentences",
+            "sentences": [
+                {"index": 0, "speaker_name": "Jane", "speaker_id": 3, "text": "Hi", "raw_text": "hi"},
+                {"index": 1, "start_time": 1.5},
+            ],
+        }
+        result = normalize_transcript(raw)
+        assert [(s.speaker, s.text) for s in result.sentences] == [("Jane", "Hi"), (None, "")]
+        assert result.sentences[1].start_time == 1.5
+
     def test_normalize_transcript_date_epoch_ms(self):
         raw = {
             "id": "test-epoch",
@@ -72,6 +100,16 @@ class TestFirefliesIngestion:
         assert record.source_id == "ff-transcript-001"
         assert record.summary is not None
 
+    def test_store_transcript_body_lines(self, sample_fireflies_transcript):
+        normalized = normalize_transcript(sample_fireflies_transcript)
+        normalized.sentences[0] = normalized.sentences[0].model_copy(update={"speaker": None})
+        record = store_transcript(normalized)
+
+        lines = record.body.split("\n")
+        assert len(lines) == len(normalized.sentences)
+        assert lines[0] == f"Unknown: {normalized.sentences[0].text}"
+        assert lines[1].startswith(f"{normalized.sentences[1].speaker}: ")
+
     def test_store_transcript_idempotent(self, sample_fireflies_transcript):
         """Storing the same transcript twice should update, not duplicate."""
         normalized = normalize_transcript(sample_fireflies_transcript)
@@ -84,6 +122,34 @@ class TestFirefliesIngestion:
         assert count == 1
         session.close()
 
+    def test_store_transcript_raw_json_stored_once(self, sample_fireflies_transcript):
+        record = store_transcript(normalize_transcript(sample_fireflies_transcript))
+
+        assert jsonio.loads(record.raw_json)["id"] == "ff-transcript-001"
+        assert "raw_json" not in jsonio.loads(record.normalized_json)
+
+    def test_store_transcripts_single_batch(self, sample_fireflies_transcript):
+        first = normalize_transcript(sample_fireflies_transcript)
+        second = normalize_transcript({**sample_fireflies_transcript, "id": "ff-transcript-002"})
+        records = store_transcripts([first, second, first])
+
+        assert [r.source_id for r in records] == [
+            "ff-transcript-001", "ff-transcript-002", "ff-transcript-001",
+        ]
+        assert records[0] is records[2]
+        assert all(r.id is not None and r.ingested_at is not None for r in records)
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        assert session.query(SourceRecord).filter_by(source_type="fireflies").count() == 2
+        session.close()
+
+    async def test_ingest_for_person_stores_all(self, sample_fireflies_transcript):
+        client = MagicMock()
+        client.search_transcripts = AsyncMock(return_value=[sample_fireflies_transcript])
+        with patch("app.ingest.fireflies_ingest.FirefliesClient", return_value=client):
+            records = await ingest_fireflies_for_person(email="jane.doe@acmecorp.com")
+
+        assert [r.source_id for r in records] == ["ff-transcript-001"]
+        assert records[0].title == "Q1 Pipeline Review with Jane Doe"
 
 class TestGmailIngestion:
     """Test Gmail message parsing and storage."""
@@ -97,6 +163,38 @@ class TestGmailIngestion:
         assert result.from_address == "me@mycompany.com"
         assert "jane.doe@acmecorp.com" in result.to_addresses
 
+    def test_normalize_email_date_formats(self, sample_gmail_message):
+        def with_date(value):
+            headers = [
+                h for h in sample_gmail_message["payload"]["headers"] if h["name"] != "Date"
+            ]
+            headers.append({"name": "Date", "value": value})
+            payload = {**sample_gmail_message["payload"], "headers": headers}
+            return normalize_email({**sample_gmail_message, "payload": payload}).date
+
+        assert with_date("Tue, 10 Feb 2026 10:00:00 -0800").utcoffset().total_seconds() == -28800
+        assert with_date("2026-02-10T18:00:00+00:00") == datetime.fromisoformat(
+            "2026-02-10T18:00:00+00:00"
+        )
+        assert with_date("not a date") is None
+
+    def test_normalize_email_recipients_with_quoted_commas(self, sample_gmail_message):
+        headers = [
+            h for h in sample_gmail_message["payload"]["headers"] if h["name"] not in ("To", "Cc")
+        ]
+        headers += [
+            {"name": "To", "value": '"Doe, Jane" <jane.doe@acmecorp.com>, bob@acmecorp.com'},
+            {"name": "Cc", "value": "Carol Chen <carol@acmecorp.com>"},
+        ]
+        raw = {
+            **sample_gmail_message,
+            "payload": {**sample_gmail_message["payload"], "headers": headers},
+        }
+        result = normalize_email(raw)
+
+        assert result.to_addresses == ["Doe, Jane <jane.doe@acmecorp.com>", "bob@acmecorp.com"]
+        assert result.cc_addresses == ["Carol Chen <carol@acmecorp.com>"]
+
     def test_normalize_email_body(self, sample_gmail_message):
         result = normalize_email(sample_gmail_message)
 
@@ -144,3 +242,54 @@ class TestGmailIngestion:
         count = session.query(SourceRecord).filter_by(source_id="gmail-msg-001").count()
         assert count == 1
         session.close()
+
+    def test_store_email_updates_in_place(self, sample_gmail_message, db_session):
+        entity = EntityRecord(name="Jane Doe", entity_type="person")
+        db_session.add(entity)
+        db_session.commit()
+
+        first = store_email(normalize_email(sample_gmail_message), entity_id=entity.id)
+        renamed = normalize_email(sample_gmail_message)
+        renamed.subject = "Renamed thread"
+        second = store_email(renamed)
+
+        assert second.id == first.id
+        assert second.title == "Renamed thread"
+        assert second.entity_id == entity.id  # kept when no entity_id is passed
+
+    def test_store_emails_single_batch(self, sample_gmail_message):
+        first = normalize_email(sample_gmail_message)
+        second = normalize_email({**sample_gmail_message, "id": "gmail-msg-002"})
+        records = store_emails([first, second])
+
+        assert [r.source_id for r in records] == ["gmail-msg-001", "gmail-msg-002"]
+        assert all(r.id is not None and r.source_type == "gmail" for r in records)
+
+
+class TestJsonIO:
+    def test_round_trip_matches_stdlib(self):
+        payload = {"participants": ["jane@acme.com"], "nested": {"n": 1.5, "ok": True}}
+        assert jsonio.loads(jsonio.dumps(payload)) == payload
+        assert isinstance(jsonio.dumps(payload), str)
+
+    def test_non_string_keys_coerced_like_stdlib(self):
+        assert jsonio.loads(jsonio.dumps({1: "a"})) == {"1": "a"}
+
+    def test_stored_participants_are_valid_json(self, sample_gmail_message):
+        record = store_email(normalize_email(sample_gmail_message))
+        assert isinstance(jsonio.loads(record.participants), list)
+
+
+class TestInitDb:
+    def test_runs_once_per_url(self):
+        url = "sqlite:///:memory:"
+        database._initialized_urls.discard(url)
+        try:
+            with patch.object(
+                database.Base.metadata, "create_all", wraps=database.Base.metadata.create_all,
+            ) as create_all:
+                database.init_db(url)
+                database.init_db(url)
+            assert create_all.call_count == 1
+        finally:
+            database._initialized_urls.discard(url)
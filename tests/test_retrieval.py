@@ -2,8 +2,39 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+from unittest.mock import MagicMock, patch
 
-from app.retrieve.retriever import RetrievedEvidence, retrieve_for_entity
+import pytest
+from sqlalchemy import inspect
+
+from app.normalize.embeddings import (
+    CHUNK_SIZE_CHARS,
+    chunk_text,
+    embed_all_pending,
+    pack_embedding,
+    unit_vector,
+    unpack_embedding,
+)
+from app.retrieve.retriever import (
+    RetrievedEvidence,
+    _cached_query_embedding,
+    _cosine_similarities,
+    _cosine_similarity,
+    _first_concern_hits,
+    _semantic_search,
+    retrieve_for_entities,
+    retrieve_for_entity,
+)
+from app.store.database import EmbeddingRecord, SourceRecord, get_session
+
+
+@pytest.fixture(autouse=True)
+def _fresh_query_embedding_cache():
+    """Mocked embedding clients differ per test; don't reuse cached vectors."""
+    _cached_query_embedding.cache_clear()
+    yield
+    _cached_query_embedding.cache_clear()
 
 
 class TestRetrieval:
@@ -25,6 +56,19 @@ class TestRetrieval:
 
         assert evidence.has_data
 
+    def test_term_match_is_case_insensitive(self, populated_db):
+        assert retrieve_for_entity(emails=["JANE.DOE@ACMECORP.COM"]).has_data
+        assert not retrieve_for_entity(emails=["nobody@example.org"]).has_data
+
+    def test_raw_payload_columns_not_loaded(self, populated_db):
+        evidence = retrieve_for_entity(person_name="Jane Doe")
+
+        for record in evidence.all_source_records:
+            unloaded = inspect(record).unloaded
+            assert {"raw_json", "normalized_json"} <= unloaded
+            # Columns evidence building reads stay usable after the session closes
+            assert record.body
+
     def test_retrieve_last_interaction(self, populated_db):
         evidence = retrieve_for_entity(entity_id=populated_db.id)
 
@@ -68,3 +112,266 @@ class TestRetrieval:
 
         empty.interactions = [{"test": True}]
         assert empty.has_data
+
+
+class TestEmbedAllPending:
+    """Test batch embedding of records that have no embeddings yet."""
+
+    def _client(self):
+        client = MagicMock()
+        client.embed.side_effect = lambda chunks: [[0.1, 0.2]] * len(chunks)
+        return client
+
+    def test_embeds_only_pending_records(self, populated_db):
+        client = self._client()
+        with patch("app.normalize.embeddings.EmbeddingClient", return_value=client):
+            first = embed_all_pending()
+            second = embed_all_pending()
+
+        assert first > 0
+        assert second == 0
+        # Both records' chunks go out in one request; nothing is re-embedded
+        assert client.embed.call_count == 1
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        rows = session.query(EmbeddingRecord).all()
+        assert len(rows) == first
+        assert all(r.created_at is not None and r.embedding for r in rows)
+        session.close()
+
+    def test_failed_batch_leaves_records_pending(self, populated_db):
+        client = self._client()
+        client.embed.side_effect = [RuntimeError("rate limited"), [[0.1]]]
+        with patch("app.normalize.embeddings.EmbeddingClient", return_value=client):
+            assert embed_all_pending(batch_size=1) == 1
+            client.embed.side_effect = lambda chunks: [[0.3]] * len(chunks)
+            assert embed_all_pending() > 0
+
+    def test_finished_batches_committed_before_a_crash(self, db_session):
+        db_session.add_all([
+            SourceRecord(source_type="gmail", source_id=f"msg-{i}", body=f"Short note {i}.")
+            for i in range(3)
+        ])
+        db_session.commit()
+        client = self._client()
+        client.embed.side_effect = [[[0.1]], [[0.2]], KeyboardInterrupt()]
+        with patch("app.normalize.embeddings.EmbeddingClient", return_value=client):
+            with pytest.raises(KeyboardInterrupt):
+                embed_all_pending(batch_size=1)
+
+        assert db_session.query(EmbeddingRecord).count() == 2
+
+    def test_record_split_across_a_failed_batch_stays_pending(self, db_session):
+        long_record = SourceRecord(
+            source_type="gmail", source_id="long",
+            body="A fairly ordinary sentence. " * (CHUNK_SIZE_CHARS // 10),
+        )
+        short_record = SourceRecord(source_type="gmail", source_id="short", body="Short note.")
+        db_session.add_all([long_record, short_record])
+        db_session.commit()
+        calls = []
+
+        def embed(chunks):
+            calls.append(chunks)
+            if len(calls) == 2:
+                raise RuntimeError("rate limited")
+            return [[0.1]] * len(chunks)
+
+        client = self._client()
+        client.embed.side_effect = embed
+        with patch("app.normalize.embeddings.EmbeddingClient", return_value=client):
+            assert embed_all_pending(batch_size=1) == 1
+
+        # The long record's remaining chunks are not sent after its failure
+        assert len(calls) == 3
+        rows = db_session.query(EmbeddingRecord.source_record_id).all()
+        assert rows == [(short_record.id,)]
+
+
+class TestConcernHits:
+    """Test concern keyword detection in record bodies."""
+
+    def test_first_hit_per_keyword_in_keyword_order(self):
+        body = "Timeline is tight. Budget RISK noted; another risk later."
+        assert _first_concern_hits(body) == [("risk", 26), ("budget", 19), ("timeline", 0)]
+
+    def test_no_hits(self):
+        assert _first_concern_hits("All good, ship it.") == []
+
+    def test_offsets_index_original_body_when_lowercase_changes_length(self):
+        body = "İstanbul office: budget concern"
+        hits = dict(_first_concern_hits(body))
+        assert body[hits["budget"]:].startswith("budget")
+        assert body[hits["concern"]:].startswith("concern")
+
+
+class TestSemanticSearch:
+    """Test embedding-based record lookup."""
+
+    def test_excluded_records_are_skipped(self, populated_db, monkeypatch):
+        client = MagicMock()
+        client.embed.side_effect = lambda chunks: [[1.0, 0.0]] * len(chunks)
+        with patch("app.normalize.embeddings.EmbeddingClient", return_value=client):
+            embed_all_pending()
+
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        client.embed_single.return_value = [1.0, 0.0]
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        ids = [r.id for r in session.query(SourceRecord).all()]
+        with patch("app.clients.openai_client.EmbeddingClient", return_value=client):
+            found = _semantic_search(session, "pricing", datetime(2000, 1, 1), {ids[0]})
+        assert [r.id for r in found] == ids[1:]
+        session.close()
+
+    def test_record_scored_by_best_chunk(self, populated_db, monkeypatch):
+        session = get_session("sqlite:///./test_briefing_engine.db")
+        rid = session.query(SourceRecord.id).first()[0]
+        for i, vec in enumerate([[0.0, 1.0], [1.0, 0.0], [0.6, 0.8]]):
+            session.add(EmbeddingRecord(
+                source_record_id=rid, chunk_index=i, chunk_text="c",
+                embedding=pack_embedding(vec),
+            ))
+        session.commit()
+
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        found = _semantic_search(
+            session, "pricing", datetime(2000, 1, 1), set(), query_vec=[1.0, 0.0],
+        )
+        assert [r.id for r in found] == [rid]
+        session.close()
+
+    def test_query_embedded_once_alongside_db_queries(self, populated_db, monkeypatch):
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        client = MagicMock()
+        client.embed_single.return_value = [1.0, 0.0]
+        with patch("app.clients.openai_client.EmbeddingClient", return_value=client):
+            evidence = retrieve_for_entity(person_name="Jane Doe")
+
+        assert evidence.has_data
+        client.embed_single.assert_called_once_with("Jane Doe")
+
+    def test_query_embedding_reused_across_calls(self, populated_db, monkeypatch):
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        client = MagicMock()
+        client.embed_single.side_effect = [RuntimeError("timeout"), [1.0, 0.0]]
+        with patch("app.clients.openai_client.EmbeddingClient", return_value=client):
+            for _ in range(3):
+                retrieve_for_entity(person_name="Jane Doe")
+
+        # The failed attempt is not cached; the successful vector is
+        assert client.embed_single.call_count == 2
+
+
+class TestRetrieveForEntities:
+    """Test multi-entity retrieval with batched query embeddings."""
+
+    def test_queries_embedded_in_one_request(self, populated_db, monkeypatch):
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        client = MagicMock()
+        client.embed.side_effect = lambda texts: [[1.0, 0.0]] * len(texts)
+        with patch("app.clients.openai_client.EmbeddingClient", return_value=client):
+            results = retrieve_for_entities([
+                {"person_name": "Jane Doe"},
+                {"company_name": "Acme Corp"},
+                {"person_name": "Jane Doe"},
+            ])
+
+        assert len(results) == 3
+        assert results[0].has_data
+        client.embed.assert_called_once_with(["Jane Doe", "Acme Corp"])
+        client.embed_single.assert_not_called()
+
+    def test_entities_share_one_session(self, populated_db):
+        with patch("app.retrieve.retriever.get_session", wraps=get_session) as opened:
+            results = retrieve_for_entities([
+                {"person_name": "Jane Doe"},
+                {"emails": ["jane.doe@acmecorp.com"]},
+            ])
+
+        assert opened.call_count == 1
+        assert all(r.has_data for r in results)
+
+    def test_malformed_batch_falls_back_per_entity(self, populated_db, monkeypatch):
+        monkeypatch.setattr("app.retrieve.retriever.settings.openai_api_key", "sk-test")
+        client = MagicMock()
+        client.embed.return_value = []
+        client.embed_single.return_value = [1.0, 0.0]
+        with patch("app.clients.openai_client.EmbeddingClient", return_value=client):
+            retrieve_for_entities([{"person_name": "Jane Doe"}, {"company_name": "Acme"}])
+
+        assert client.embed_single.call_count == 2
+
+
+class TestEmbeddingPacking:
+    """Test the text encoding used for stored embedding vectors."""
+
+    def test_round_trip(self):
+        vector = [0.5, -0.25, 1.0]
+        packed = pack_embedding(vector)
+
+        assert isinstance(packed, str)
+        assert list(unpack_embedding(packed)) == vector
+
+    def test_unpacks_legacy_json(self):
+        assert unpack_embedding("[0.1, 0.2]") == [0.1, 0.2]
+
+    def test_malformed_raises_value_error(self):
+        with pytest.raises(ValueError):
+            unpack_embedding("not base64!")
+
+    def test_pgvector_gets_json_text(self, monkeypatch):
+        # A vector(1536) column only accepts the '[...]' text form
+        monkeypatch.setattr("app.normalize.embeddings.pgvector_available", lambda: True)
+        packed = pack_embedding([0.5, -0.25])
+
+        assert packed == "[0.5,-0.25]"
+        assert unpack_embedding(packed) == [0.5, -0.25]
+
+
+class TestUnitVector:
+    """Test write-time normalization of embedding vectors."""
+
+    def test_scales_to_unit_length(self):
+        assert unit_vector([3.0, 4.0]) == pytest.approx([0.6, 0.8])
+
+    def test_zero_vector_unchanged(self):
+        assert unit_vector([0.0, 0.0]) == [0.0, 0.0]
+
+
+class TestChunkText:
+    """Test sentence-boundary chunking of record bodies."""
+
+    def test_short_text_is_one_chunk(self):
+        assert chunk_text("One. Two.\nThree.") == ["One. Two. Three."]
+
+    def test_splits_on_sentence_boundaries(self):
+        text = "Alpha beta. Gamma delta. Epsilon."
+        assert chunk_text(text, chunk_size=12) == ["Alpha beta.", "Gamma delta.", "Epsilon."]
+
+    def test_empty(self):
+        assert chunk_text("") == []
+
+
+class TestCosineSimilarity:
+    """Test the vector similarity used by semantic search."""
+
+    def test_parallel_and_orthogonal(self):
+        assert _cosine_similarity([1.0, 2.0], [2.0, 4.0]) == pytest.approx(1.0)
+        assert _cosine_similarity([1.0, 0.0], [0.0, 3.0]) == 0.0
+
+    def test_zero_vector(self):
+        assert _cosine_similarity([0.0, 0.0], [1.0, 1.0]) == 0.0
+
+    def test_batch_matches_pairwise(self):
+        query = [1.0, 2.0, 3.0]
+        vectors = [[3.0, 2.0, 1.0], [0.0, 0.0, 0.0], [2.0, 4.0, 6.0]]
+        sims = _cosine_similarities(query, vectors)
+        assert sims == [_cosine_similarity(query, v) for v in vectors]
+        assert sims[1] == 0.0
+        assert sims[2] == pytest.approx(1.0)
+
+    def test_unit_vectors_skip_per_vector_norm(self):
+        query = [3.0, 4.0]
+        vectors = [unit_vector([1.0, 2.0]), unit_vector([0.0, 5.0])]
+        assert _cosine_similarities(query, vectors, unit_vectors=True) == pytest.approx(
+            _cosine_similarities(query, vectors)
+        )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import time
 
 os.environ["DATABASE_URL"] = "sqlite:///./test_briefing_engine.db"
 os.environ["OPENAI_API_KEY"] = ""
@@ -75,6 +76,21 @@ class TestSourceTierClassification:
     def test_press_release_is_primary(self):
         assert classify_source_tier("https://www.businesswire.com/news/123") == SourceTier.PRIMARY
 
+    def test_matches_on_host_not_path(self):
+        assert classify_source_tier("https://uk.linkedin.com/in/someone") == SourceTier.PRIMARY
+        assert classify_source_tier(
+            "https://blog.example.com/share?u=linkedin.com"
+        ) == SourceTier.SECONDARY
+
+    def test_mixed_case_url(self):
+        assert classify_source_tier("https://WWW.LinkedIn.com/in/Someone") == SourceTier.PRIMARY
+
+    def test_url_without_host_defaults_to_secondary(self):
+        assert classify_source_tier("https:///linkedin.com") == SourceTier.SECONDARY
+
+    def test_schemeless_url_falls_back_to_substring(self):
+        assert classify_source_tier("www.sec.gov/cgi-bin/browse-edgar") == SourceTier.PRIMARY
+
 
 class TestNormalizeResult:
     def test_extracts_all_fields(self):
@@ -157,9 +173,19 @@ class TestFormatWebResults:
         formatted = format_web_results_for_prompt(results)
         assert "VP Engineering at Acme Corp" in formatted
 
+    def test_accepts_generators(self):
+        results = {
+            "general": (_normalize_result(r) for r in SAMPLE_ORGANIC_RESULTS),
+            "news": iter([]),
+        }
+        formatted = format_web_results_for_prompt(results)
+        assert formatted.startswith("The following web search results")
+        assert "3. [SECONDARY] **Acme Corp Raises $50M Series C**" in formatted
+        assert "News & Articles" not in formatted
+
     def test_multiple_categories(self):
         results = {
-            "general": [_normalize_result(SAMPLE_ORGANIC_RESULTS[0])],
+            "general": [_normalize_result(SAMPLE_ORGANIC_RESULTS[2])],
             "linkedin": [_normalize_result(SAMPLE_ORGANIC_RESULTS[0])],
             "news": [_normalize_result(SAMPLE_ORGANIC_RESULTS[1])],
             "talks": [],
@@ -170,6 +196,30 @@ class TestFormatWebResults:
         assert "News & Articles" in formatted
         assert "Conference Talks" not in formatted  # empty
 
+    def test_duplicate_links_listed_once(self):
+        linkedin = _normalize_result(SAMPLE_ORGANIC_RESULTS[0])
+        techcrunch = _normalize_result(SAMPLE_ORGANIC_RESULTS[1])
+        results = {
+            "general": [linkedin, techcrunch],
+            "linkedin": [linkedin],
+            "news": [techcrunch, _normalize_result(SAMPLE_ORGANIC_RESULTS[2])],
+        }
+        formatted = format_web_results_for_prompt(results)
+        assert formatted.count("https://www.linkedin.com/in/janedoe") == 1
+        assert formatted.count(SAMPLE_ORGANIC_RESULTS[1]["link"]) == 1
+        assert "LinkedIn Results" not in formatted
+        assert "1. [SECONDARY] **Acme Corp Raises $50M Series C**" in formatted
+
+    def test_duplicate_link_keeps_highest_tier(self):
+        url = "https://www.linkedin.com/in/janedoe"
+        low = {"title": "Jane Doe mirror", "link": url, "snippet": "", "tier": 3}
+        primary = {"title": "Jane Doe - CEO", "link": url, "snippet": "", "tier": 1}
+        formatted = format_web_results_for_prompt({"general": [low], "linkedin": [primary]})
+        assert formatted.count(url) == 1
+        assert "Jane Doe mirror" not in formatted
+        assert "LinkedIn Results" in formatted
+        assert "1. [PRIMARY] **Jane Doe - CEO**" in formatted
+
     def test_date_shown_when_present(self):
         results = {
             "general": [_normalize_result(SAMPLE_ORGANIC_RESULTS[0])],
@@ -303,6 +353,26 @@ class TestSerpAPIClient:
             results = await client.search("test")
             assert results == []
 
+    def test_low_quota_headers_push_back_next_request(self):
+        client = SerpAPIClient(api_key="test-key")
+        client._update_rate_limit(
+            200, {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "10"},
+        )
+        assert client._not_before - time.monotonic() == pytest.approx(5.0, abs=0.5)
+
+    def test_ample_quota_headers_do_not_throttle(self):
+        client = SerpAPIClient(api_key="test-key")
+        client._update_rate_limit(
+            200, {"X-RateLimit-Remaining": "900", "X-RateLimit-Reset": "10"},
+        )
+        client._update_rate_limit(200, {})
+        assert client._not_before == 0.0
+
+    def test_429_honours_retry_after(self):
+        client = SerpAPIClient(api_key="test-key")
+        client._update_rate_limit(429, {"Retry-After": "7"})
+        assert client._not_before - time.monotonic() == pytest.approx(7.0, abs=0.5)
+
     @pytest.mark.asyncio
     async def test_search_handles_exception(self):
         with patch("app.clients.serpapi.httpx.AsyncClient") as MockClient: